@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import traceback
+from pathlib import Path
+
+import String_cache
+
+PYTHON_DIR = Path(__file__).resolve().parent
+
+
+def _run_seed(task):
+    """Build the network of one seed file in this worker process; returns (seed, html path or None, error)."""
+    seed, work_dir, layers, thresholds, cache_path, rate_limit = task
+    work_dir.mkdir(parents=True, exist_ok=True)
+    out_html = work_dir / f"{work_dir.name}.html"
+    os.environ["PSD_CACHE"] = cache_path
+    os.environ["PSD_RATE_LIMIT"] = str(rate_limit)
+    if str(PYTHON_DIR) not in sys.path:
+        sys.path.insert(0, str(PYTHON_DIR))
+    from Network_builder import build_network, options_from_env
+
+    with open(work_dir / "run.log", "w", encoding="utf-8") as log:
+        try:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                build_network(str(seed), layers, [int(x) for x in thresholds.split(",") if x.strip().isdigit()],
+                              out_html, work_dir, **options_from_env())
+        except BaseException as e:
+            traceback.print_exc(file=log)
+            return str(seed), None, f"{type(e).__name__}: {e}; see {work_dir / 'run.log'}"
+    return str(seed), str(out_html), None
+
+
+def worker_rate_limit(workers):
+    """
+    The STRING requests per second each of workers processes may send, so
+    that the batch as a whole stays within $PSD_RATE_LIMIT (default 1,
+    0 = unlimited): every process has its own client and rate limiter.
+    """
+    return float(os.getenv("PSD_RATE_LIMIT", "1")) / workers
+
+
+def run_batch(seed_files, layers, thresholds, out_dir, workers=None):
+    """
+    Expand every seed file with build_network, in parallel.
+
+    Each seed runs in its own worker process and writes
+    its HTML, layer files and run.log into out_dir/<seed name>/. All workers
+    read STRING through the same response cache file, where partners are
+    stored per protein and claimed while being fetched, so a protein shared
+    by several seeds is downloaded once for the whole batch. $PSD_RATE_LIMIT
+    is shared: each worker gets an equal part of it (worker_rate_limit).
+
+    Returns {seed: html path}; seeds that failed map to None.
+    """
+    cache_path = String_cache.default_cache_path()
+    if cache_path is None:
+        print("[WARN] PSD_CACHE is off: seeds in this batch will not share fetched partners")
+    out_dir = Path(out_dir).resolve()
+
+    tasks = []
+    used_names = set()
+    for seed in seed_files:
+        seed = Path(seed).resolve()
+        if not seed.exists():
+            raise FileNotFoundError(f"Input file not found: {seed}")
+        name = seed.stem
+        while name in used_names:
+            name += "_"
+        used_names.add(name)
+        tasks.append((seed, out_dir / name, layers, thresholds, "off" if cache_path is None else str(cache_path)))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    rate_limit = worker_rate_limit(workers)
+    tasks = [task + (rate_limit,) for task in tasks]
+    print(f"[INFO] Expanding {len(tasks)} seeds with {workers} worker processes into: {out_dir}")
+    print(f"[INFO] STRING rate limit per worker: {rate_limit:g} requests/s")
+
+    results = {}
+    with multiprocessing.get_context("spawn").Pool(workers, maxtasksperchild=1) as pool:
+        for seed, out_html, error in pool.imap_unordered(_run_seed, tasks):
+            results[seed] = out_html
+            if error is None:
+                print(f"[INFO] ✅ {seed} -> {out_html}")
+            else:
+                print(f"[ERROR] {seed} failed: {error}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand several seed files in parallel worker processes.")
+    parser.add_argument("seeds", nargs="+", help="seed TSV files (same format as scaffolds.tsv)")
+    parser.add_argument("--layers", type=int, required=True, help="number of layers to expand")
+    parser.add_argument("--thresholds", default="2", help="per-layer minimum interactions, e.g. 3,2,2")
+    parser.add_argument("--out-dir", default="batch", help="directory receiving one subdirectory per seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    results = run_batch(args.seeds, args.layers, args.thresholds, args.out_dir, args.workers)
+    failed = [seed for seed, out_html in results.items() if out_html is None]
+    if failed:
+        sys.exit(f"[ERROR] {len(failed)} of {len(results)} seeds failed")
+
+
+if __name__ == "__main__":
+    main()
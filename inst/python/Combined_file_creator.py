@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
-import requests
 from pathlib import Path
-from get_files1 import create_file_if_not_exists
+import String_api
+from get_files1 import interaction_row, write_rows
 
 # Folder where this file lives (your package's python dir)
 BASE_DIR = Path(__file__).resolve().parent
@@ -22,63 +22,53 @@ def _deep_flatten_to_str(x):
     return flat
 
 
-def Create_combined_interactions_file(up_to_layer_i, my_genes):
+def network_records(my_genes):
+    """ Yield (name_a, name_b, combined_score) for every STRING network edge among my_genes """
+    flat_genes = _deep_flatten_to_str(my_genes)
+    if not flat_genes:
+        return
+    response_text = String_api.query("network", flat_genes)
+    for line in response_text.strip().split("\n"):
+        parts = line.strip().split("\t")
+        if len(parts) >= 6:
+            yield parts[2], parts[3], parts[5]
+
+
+def Create_combined_interactions_file(up_to_layer_i, my_genes, directory=None):
     """
     Given a protein list (possibly nested), fetch STRING interactions and
-    write them to <BASE_DIR>/<up_to_layer_i>.tsv
+    write them to <directory>/<up_to_layer_i>.tsv (default: the current
+    directory)
     """
     # 1) make sure it's flat strings
     flat_genes = _deep_flatten_to_str(my_genes)
     print(f"[DEBUG] Create_combined_interactions_file got genes: {flat_genes}")
 
+    output_path = Path(directory or Path.cwd()) / f"{up_to_layer_i}.tsv"
+
     # 2) if nothing to query, just create an empty file and return
+    #    (the file is always started afresh, never appended to a file of an earlier build)
     if not flat_genes:
-        output_path = BASE_DIR / f"{up_to_layer_i}.tsv"
-        create_file_if_not_exists(output_path)
+        write_rows(output_path, [], append=False)
         print(f"[INFO] Gene list was empty, created empty file at: {output_path}")
         return output_path
 
-    # 3) build request to STRING
-    string_api_url = "https://string-db.org/api"
-    output_format = "tsv-no-header"
-    method = "network"
-    request_url = "/".join([string_api_url, output_format, method])
-
-    params = {
-        # this is now guaranteed to be a list of strings
-        "identifiers": "%0d".join(flat_genes),
-        "species": 9606,          # human
-        "caller_identity": "PSDExplorer",
-    }
-
-    # 4) prepare output
-    #output_path = BASE_DIR / f"{up_to_layer_i}.tsv"
-    output_path = Path.cwd() / f"{up_to_layer_i}.tsv"
-    create_file_if_not_exists(output_path)
+    # 3) prepare output
+    write_rows(output_path, [], append=False)
     print(f"[INFO] Writing interactions to: {output_path}")
 
-    # 5) call STRING
+    # 4) call STRING (read through the local response cache; the shared
+    #    client retries transient failures and raises if they persist,
+    #    so a layer is never silently built from an empty file)
+    #    (2 names, 10 zeros, score per row)
     try:
-        resp = requests.post(request_url, data=params)
-        resp.raise_for_status()
+        rows = [interaction_row(*record) for record in network_records(flat_genes)]
     except Exception as e:
         print(f"[ERROR] STRING request failed: {e}")
-        return output_path
-
-    # 6) write results
-    for line in resp.text.strip().split("\n"):
-        parts = line.strip().split("\t")
-        if len(parts) >= 6:
-            query_name = parts[2]
-            partner_name = parts[3]
-            combined_score = parts[5]
+        raise
 
-            with open(output_path, "a", encoding="utf-8") as f:
-                # match your previous format: 2 ids, 10 zeros, score
-                row = "\t".join(
-                    [query_name, partner_name] + ["0"] * 10 + [combined_score]
-                )
-                f.write(row + "\n")
+    # 5) write results in one pass
+    write_rows(output_path, rows)
 
-    print(f"[INFO] ✅ Wrote combined file: {output_path}")
+    print(f"[INFO] ✅ Wrote combined file: {output_path} ({len(rows)} interactions)")
     return output_path
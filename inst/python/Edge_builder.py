@@ -0,0 +1,108 @@
+def canonical_edge(name0, name1):
+    """The (smaller, larger) name pair identifying an undirected edge."""
+    return (name0, name1) if name0 <= name1 else (name1, name0)
+
+
+def node_options(name, shape, font_color=False, color="#97c2fc", **options):
+    """
+    The vis.js options of a node, as pyvis' Network.add_node builds them:
+    the colour (add_node's default unless a group sets it) before the
+    other options, then id, label, shape and font, in that key order.
+    """
+    if "group" not in options:
+        options = {"color": color, **options}
+    options.update(id=name, label=name, shape=shape)
+    if font_color:
+        options["font"] = dict(color=font_color)
+    return options
+
+
+def edge_options(source, dest, directed=False, **options):
+    """The vis.js options of an edge, as pyvis.edge.Edge builds them."""
+    options.update({"from": source, "to": dest})
+    if directed and "arrows" not in options:
+        options["arrows"] = "to"
+    return options
+
+
+class EdgeBuilder:
+    """
+    Adds the nodes and edges of each layer to a pyvis Network exactly once.
+
+    pyvis' add_node and add_edge scan every node / edge already in the
+    network to reject duplicates, which makes building the graph quadratic.
+    The builder remembers which nodes and canonical edges it has emitted
+    and appends only new ones directly, so a layer costs O(new edges).
+    Given a writer (Graph_writer.StreamingGraphWriter), the node and edge
+    options are streamed to it instead of being kept in the network.
+    Without a graph or a writer they are kept until add_to(graph), so pyvis
+    does not have to be imported before the network is rendered.
+    """
+
+    def __init__(self, graph=None, writer=None, font_color="black", directed=False):
+        self.graph = graph
+        self.writer = writer
+        self.font_color = font_color if graph is None else graph.font_color
+        self.directed = directed if graph is None else graph.directed
+        self.nodes = set()
+
+        # canonical edge -> likelihood it was added with
+        self.edges = {}
+
+        # options kept for add_to while there is neither a graph nor a writer
+        self.node_options = []
+        self.edge_options = []
+
+    def add_to(self, graph):
+        """Move the nodes and edges added so far into graph (a pyvis Network) and add later ones there too."""
+        for options in self.node_options:
+            self._append_node(graph, options)
+        graph.edges.extend(self.edge_options)
+        self.node_options = []
+        self.edge_options = []
+        self.graph = graph
+        return graph
+
+    @staticmethod
+    def _append_node(graph, options):
+        graph.nodes.append(options)
+        graph.node_ids.append(options["id"])
+        graph.node_map[options["id"]] = options
+
+    def add_nodes(self, names, shape="dot", **options):
+        for name in names:
+            if name in self.nodes:
+                continue
+            self.nodes.add(name)
+            node = node_options(name, shape, font_color=self.font_color, **options)
+            if self.writer is not None:
+                self.writer.add_node(node)
+            elif self.graph is not None:
+                self._append_node(self.graph, node)
+            else:
+                self.node_options.append(node)
+
+    def add_edges(self, proteins):
+        """Add every edge of proteins (Protein objects) that was not added before."""
+        for protein in proteins:
+            for interacting_protein, likelihood in protein.interactions.items():
+                self._add_edge(protein.name, interacting_protein.name, likelihood)
+
+    def add_table_edges(self, table, names):
+        """add_edges for the proteins names of an InteractionTable, without building Protein objects."""
+        protein, partner, score = table.partners([table.name_to_id[name] for name in names])
+        for i, j, likelihood in zip(protein.tolist(), partner.tolist(), score.tolist()):
+            self._add_edge(table.names[i], table.names[j], likelihood)
+
+    def _add_edge(self, name0, name1, likelihood):
+        key = canonical_edge(name0, name1)
+        if key in self.edges:
+            return
+        self.edges[key] = likelihood
+        edge = edge_options(name0, name1, self.directed, label=likelihood, title=likelihood)
+        if self.writer is not None:
+            self.writer.add_edge(edge)
+        elif self.graph is not None:
+            self.graph.edges.append(edge)
+        else:
+            self.edge_options.append(edge)
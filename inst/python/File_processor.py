@@ -1,7 +1,6 @@
 from Protein_attributes import Protein
 
 import csv
-from pyvis.network import Network
 
 
 class InteractionProcessor:
@@ -14,10 +13,35 @@ class InteractionProcessor:
         self.total_proteins = []
         self.protein_name_list = []
 
+        # name -> Protein index kept alongside self.total_proteins
+        # so that lookups while building the graph are O(1)
+        self.protein_index = {}
+
         # the dictionary of protein interactions that is going to be formed
         # string dictionary
         self.interactions = {}
 
+    @classmethod
+    def from_table(cls, table, file1=None):
+
+        # build the same proteins and interactions process_interactions would,
+        # straight from an already filtered InteractionTable
+        # (self.interactions then only holds the pairs that passed the filter)
+        processor = cls(file1)
+        for protein_name in table.names:
+            protein = Protein(protein_name)
+            processor.protein_index[protein_name] = protein
+            processor.protein_name_list.append(protein_name)
+            processor.total_proteins.append(protein)
+
+        for source, target, score in zip(table.source.tolist(), table.target.tolist(), table.score.tolist()):
+            protein0 = processor.total_proteins[source]
+            protein1 = processor.total_proteins[target]
+            processor.interactions[(protein0.name, protein1.name)] = {'combined_score': score}
+            protein0.add_interaction(protein1, score)
+            protein1.add_interaction(protein0, score)
+        return processor
+
     def read_interaction_data(self):
 
         # read through the file_path and create a string dictionary of protein interactions
@@ -43,9 +67,11 @@ class InteractionProcessor:
         for pair in self.interactions:
             if self.interactions[pair]['combined_score'] > 0.95:
                 for protein_name in pair:
-                    if protein_name not in self.protein_name_list:
+                    if protein_name not in self.protein_index:
+                        protein = Protein(protein_name)
+                        self.protein_index[protein_name] = protein
                         self.protein_name_list.append(protein_name)
-                        self.total_proteins.append(Protein(protein_name))
+                        self.total_proteins.append(protein)
 
     def process_interactions(self):
 
@@ -59,8 +85,8 @@ class InteractionProcessor:
         # create Protein class interactions depending on the desired likelihood
         for pair in self.interactions:
             if self.interactions[pair]['combined_score'] > 0.95:
-                protein0 = next((protein for protein in self.total_proteins if protein.name == pair[0]), None)
-                protein1 = next((protein for protein in self.total_proteins if protein.name == pair[1]), None)
+                protein0 = self.protein_index.get(pair[0])
+                protein1 = self.protein_index.get(pair[1])
 
                 if protein0 and protein1:
                     protein0.add_interaction(protein1, self.interactions[pair]['combined_score'])
@@ -0,0 +1,273 @@
+import json
+from pathlib import Path
+from string import Template
+
+VIS_NETWORK_JS = "https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js"
+BATCH_SIZE = 5000  # nodes / edges per PSD.n(...) / PSD.e(...) call in the data file
+EAGER_LAYERS = 2   # layers a per-layer page loads up front (the scaffolds and layer 1)
+
+
+def vis_options(physics=True):
+    """
+    The vis.js options of the page as JSON: those of a default pyvis
+    Network, or with physics=False those left after disable_physics (no
+    force simulation and straight edges, for fixed positions).
+    """
+    options = {
+        "configure": {"enabled": False},
+        "edges": {"color": {"inherit": True}, "smooth": {"enabled": physics, "type": "dynamic"}},
+        "interaction": {"dragNodes": True, "hideEdgesOnDrag": False, "hideNodesOnDrag": False},
+        "physics": {"enabled": physics,
+                    "stabilization": {"enabled": True, "fit": True, "iterations": 1000,
+                                      "onlyDynamicEdges": False, "updateInterval": 50}},
+    }
+    return json.dumps(options, indent=4)
+
+
+# The data file is plain JavaScript rather than .json so that the page also
+# works when opened from disk (file:// pages may not fetch JSON files).
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<script src="$vis_js"></script>
+<style>
+  html, body { margin: 0; }
+  #network { width: $width; height: $height; background-color: $bgcolor; }
+</style>
+</head>
+<body>
+<div id="network"></div>
+<script>
+var PSD = {
+  nodes: [], edges: [], positions: {},
+  n: function (batch) { for (var i = 0; i < batch.length; i++) this.nodes.push(batch[i]); },
+  e: function (batch) { for (var i = 0; i < batch.length; i++) this.edges.push(batch[i]); },
+  p: function (batch) { Object.assign(this.positions, batch); }
+};
+</script>
+<script src="$data_file"></script>
+<script>
+PSD.nodes.forEach(function (node) {
+  var position = PSD.positions[node.id];
+  if (position) { node.x = position[0]; node.y = position[1]; node.physics = false; }
+});
+new vis.Network(document.getElementById("network"),
+                {nodes: new vis.DataSet(PSD.nodes), edges: new vis.DataSet(PSD.edges)},
+                $options);
+</script>
+</body>
+</html>
+""")
+
+# Per-layer page: every layer file starts with PSD.layer(k), is loaded with a
+# script tag (the first ones up front, deeper ones when their box is ticked)
+# and is added to / removed from the shown DataSets as a whole.
+LAYERED_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<script src="$vis_js"></script>
+<style>
+  html, body { margin: 0; font-family: sans-serif; }
+  #layers { padding: 6px 10px; }
+  #layers label { margin-right: 14px; }
+  #network { width: $width; height: $height; background-color: $bgcolor; }
+</style>
+</head>
+<body>
+<div id="layers"></div>
+<div id="network"></div>
+<script>
+var nodes = new vis.DataSet(), edges = new vis.DataSet();
+var PSD = {
+  files: $layer_files, sizes: $layer_sizes, data: {}, current: null,
+  layer: function (k) { this.current = this.data[k] = {number: k, nodes: [], edges: [], positions: {}}; },
+  n: function (batch) { for (var i = 0; i < batch.length; i++) this.current.nodes.push(batch[i]); },
+  e: function (batch) {
+    var layer = this.current;
+    for (var i = 0; i < batch.length; i++) {
+      batch[i].id = layer.number + ":" + layer.edges.length;
+      layer.edges.push(batch[i]);
+    }
+  },
+  p: function (batch) { Object.assign(this.current.positions, batch); },
+  load: function (k, done) {
+    if (this.data[k]) return done();
+    var script = document.createElement("script");
+    script.src = this.files[k];
+    script.onload = done;
+    document.head.appendChild(script);
+  },
+  show: function (k) {
+    var layer = this.data[k];
+    layer.nodes.forEach(function (node) {
+      var position = layer.positions[node.id];
+      if (position) { node.x = position[0]; node.y = position[1]; node.physics = false; }
+    });
+    nodes.update(layer.nodes);
+    edges.update(layer.edges);
+  },
+  hide: function (k) {
+    var layer = this.data[k];
+    if (!layer) return;
+    nodes.remove(layer.nodes.map(function (node) { return node.id; }));
+    edges.remove(layer.edges.map(function (edge) { return edge.id; }));
+  }
+};
+</script>
+$eager_scripts
+<script>
+new vis.Network(document.getElementById("network"), {nodes: nodes, edges: edges}, $options);
+PSD.files.forEach(function (file, k) {
+  var box = document.createElement("input");
+  box.type = "checkbox";
+  box.checked = k < $eager;
+  box.onchange = function () {
+    if (box.checked) PSD.load(k, function () { if (box.checked) PSD.show(k); });
+    else PSD.hide(k);
+  };
+  var label = document.createElement("label");
+  label.appendChild(box);
+  label.appendChild(document.createTextNode(" Layer " + k + " (" + PSD.sizes[k] + ")"));
+  document.getElementById("layers").appendChild(label);
+  if (box.checked) PSD.show(k);
+});
+</script>
+</body>
+</html>
+""")
+
+
+class StreamingGraphWriter:
+    """
+    Writes a network as a small HTML page plus a <name>_data.js file.
+
+    Nodes and edges (vis.js option dicts, as pyvis builds them) are written
+    to the data file in batches of BATCH_SIZE as soon as they are added, so
+    the graph is never held in memory as a whole. close() adds the optional
+    fixed positions and writes the page, which loads the data file with a
+    script tag and draws it with vis-network.
+
+    With per_layer, each layer started with start_layer goes to its own
+    <name>_layer<k>.js instead (its nodes and the edges it adds). The page
+    loads the first eager_layers of them and has a toggle per layer that
+    fetches deeper layers only when they are switched on.
+    """
+
+    def __init__(self, out_html, height="600px", width="100%", bgcolor="#ffffff",
+                 per_layer=False, eager_layers=EAGER_LAYERS):
+        self.out_html = Path(out_html)
+        self.data_path = self.out_html.with_name(f"{self.out_html.stem}_data.js")
+        self.height, self.width, self.bgcolor = height, width, bgcolor
+        self.per_layer = per_layer
+        self.eager_layers = eager_layers
+        self.node_count = 0
+        self.edge_count = 0
+
+        # per_layer: file name and node count of every layer started so far
+        self.layer_files = []
+        self.layer_sizes = []
+        self._nodes = []
+        self._edges = []
+        self._file = None if per_layer else self._open(self.data_path, "w")
+
+    @classmethod
+    def for_network(cls, out_html, graph, **kwargs):
+        """A writer using the size and background of a pyvis Network."""
+        return cls(out_html, graph.height, graph.width, graph.bgcolor, **kwargs)
+
+    @staticmethod
+    def _open(path, mode):
+        return open(path, mode, encoding="utf-8", buffering=1 << 16)
+
+    def _layer_path(self, number):
+        return self.out_html.with_name(f"{self.out_html.stem}_layer{number}.js")
+
+    def start_layer(self, number):
+        """Send the following nodes and edges to layer number (only changes anything with per_layer)."""
+        if not self.per_layer:
+            return
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+        path = self._layer_path(number)
+        self.layer_files.append(path.name)
+        self.layer_sizes.append(0)
+        self._file = self._open(path, "w")
+        self._file.write(f"PSD.layer({number});\n")
+
+    def add_node(self, options):
+        self._nodes.append(options)
+        self.node_count += 1
+        if self.layer_sizes:
+            self.layer_sizes[-1] += 1
+        if len(self._nodes) >= BATCH_SIZE:
+            self._write("n", self._nodes)
+
+    def add_edge(self, options):
+        self._edges.append(options)
+        self.edge_count += 1
+        if len(self._edges) >= BATCH_SIZE:
+            self._write("e", self._edges)
+
+    def add_positions(self, positions, layers=None):
+        """
+        Fixed coordinates (name -> (x, y)) applied to the nodes when the page
+        loads. With per_layer, layers (the name list of every layer) says
+        which layer file receives each position.
+        """
+        self._flush()
+        if not self.per_layer:
+            self._write_positions(self._file, positions.items())
+            return
+
+        self._file.close()
+        for number, names in enumerate(layers):
+            with self._open(self._layer_path(number), "a") as file:
+                self._write_positions(file, ((name, positions[name]) for name in names if name in positions))
+        self._file = None
+
+    @staticmethod
+    def _write_positions(file, items):
+        items = list(items)
+        for start in range(0, len(items), BATCH_SIZE):
+            batch = {name: [round(x, 2), round(y, 2)] for name, (x, y) in items[start:start + BATCH_SIZE]}
+            file.write(f"PSD.p({json.dumps(batch, separators=(',', ':'))});\n")
+
+    def _write(self, kind, batch):
+        self._file.write(f"PSD.{kind}({json.dumps(batch, separators=(',', ':'))});\n")
+        batch.clear()
+
+    def _flush(self):
+        if self._nodes:
+            self._write("n", self._nodes)
+        if self._edges:
+            self._write("e", self._edges)
+
+    def close(self, options_json=None, title="PSDExplorer network"):
+        """Finish the data file(s) and write the HTML page (options_json: vis.js options, default vis_options())."""
+        if options_json is None:
+            options_json = vis_options()
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        common = dict(title=title, vis_js=VIS_NETWORK_JS, width=self.width, height=self.height,
+                      bgcolor=self.bgcolor, options=options_json)
+        if self.per_layer:
+            eager = "\n".join(f'<script src="{name}"></script>' for name in self.layer_files[:self.eager_layers])
+            page = LAYERED_TEMPLATE.substitute(common, layer_files=json.dumps(self.layer_files),
+                                               layer_sizes=json.dumps(self.layer_sizes),
+                                               eager_scripts=eager, eager=self.eager_layers)
+            written = f"{len(self.layer_files)} layer files next to {self.out_html}"
+        else:
+            page = HTML_TEMPLATE.substitute(common, data_file=self.data_path.name)
+            written = str(self.data_path)
+        with open(self.out_html, "w", encoding="utf-8") as file:
+            file.write(page)
+        print(f"[INFO] Wrote {self.node_count} nodes and {self.edge_count} edges to: {written}")
+        return self.out_html
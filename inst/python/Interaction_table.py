@@ -0,0 +1,96 @@
+import warnings
+
+import numpy as np
+
+# same cut InteractionProcessor applies to combined_score
+MIN_COMBINED_SCORE = 0.95
+
+
+class InteractionTable:
+    """
+    Columnar form of a 13-column STRING interaction file.
+
+    Protein names are interned to integer ids (self.names[i] is the name of
+    id i) and edges are stored as parallel arrays. Only the pairs whose
+    combined_score passes the filter are kept, and ids are numbered in the
+    order the proteins first appear in those pairs, which is the same order
+    InteractionProcessor.total_proteins uses.
+    """
+
+    def __init__(self, names, source, target, score):
+        self.names = names
+        self.name_to_id = {name: i for i, name in enumerate(names)}
+
+        # int32 protein ids and float64 combined scores, one entry per pair
+        self.source = source
+        self.target = target
+        self.score = score
+
+    def __len__(self):
+        return len(self.score)
+
+    @classmethod
+    def from_tsv(cls, file_path, min_score=MIN_COMBINED_SCORE):
+        # the first line is the header, exactly like read_interaction_data
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # header-only files
+            columns = np.loadtxt(file_path, delimiter="\t", skiprows=1, usecols=(0, 1, 12),
+                                 dtype=str, comments=None, ndmin=2, encoding="utf-8")
+        return cls.from_columns(columns[:, 0], columns[:, 1], columns[:, 2].astype(np.float64), min_score)
+
+    @classmethod
+    def from_columns(cls, node1, node2, score, min_score=MIN_COMBINED_SCORE):
+        node1 = np.asarray(node1, dtype=str)
+        node2 = np.asarray(node2, dtype=str)
+        score = np.asarray(score, dtype=np.float64)
+        if len(score) == 0:
+            return cls([], np.empty(0, np.int32), np.empty(0, np.int32), score)
+
+        all_names, ids = np.unique(np.concatenate([node1, node2]), return_inverse=True)
+        source, target = ids[:len(score)], ids[len(score):]
+
+        # a repeated (node1, node2) pair keeps its first position and its last
+        # score, as the dict in read_interaction_data does
+        codes = source.astype(np.int64) * len(all_names) + target
+        _, first = np.unique(codes, return_index=True)
+        _, last_reversed = np.unique(codes[::-1], return_index=True)
+        pair_score = score[len(score) - 1 - last_reversed]
+
+        keep = pair_score > min_score
+        rows = np.sort(first[keep])
+        order = np.argsort(first[keep], kind="stable")
+        source, target, score = source[rows], target[rows], pair_score[keep][order]
+
+        # renumber proteins by first appearance among the kept pairs
+        endpoints = np.column_stack([source, target]).ravel()
+        present, first_seen = np.unique(endpoints, return_index=True)
+        present = present[np.argsort(first_seen)]
+        new_id = np.empty(len(all_names), dtype=np.int32)
+        new_id[present] = np.arange(len(present), dtype=np.int32)
+
+        return cls(all_names[present].tolist(), new_id[source], new_id[target], score)
+
+    def partners(self, ids):
+        """
+        (protein, partner, score) id arrays of the interactions of the
+        proteins ids, as InteractionProcessor.from_table would give them:
+        protein by protein in the order of ids, each partner once, in the
+        order of its first pair with the protein and with the score of the last.
+        """
+        rank = np.full(len(self.names), -1, dtype=np.int64)
+        rank[np.asarray(ids, dtype=np.int64)] = np.arange(len(ids))
+
+        # every pair adds target to source's interactions, then source to target's
+        protein = np.column_stack([self.source, self.target]).ravel().astype(np.int64)
+        partner = np.column_stack([self.target, self.source]).ravel().astype(np.int64)
+        score = np.repeat(self.score, 2)
+        keep = rank[protein] >= 0
+        protein, partner, score = protein[keep], partner[keep], score[keep]
+
+        codes = protein * len(self.names) + partner
+        _, first = np.unique(codes, return_index=True)
+        _, last_reversed = np.unique(codes[::-1], return_index=True)
+        last_score = score[len(codes) - 1 - last_reversed]
+        order = np.lexsort((first, rank[protein[first]]))
+        first = first[order]
+        return protein[first], partner[first], last_score[order]
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from Layer_index import KINDS
+from String_cache import DEFAULT_TTL
+
+# bump when the checkpoint layout, the layer rules or the row order of the
+# fetched network change (2: rows always come from one network query)
+CHECKPOINT_FORMAT = 2
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_checkpoint_dir(work_dir):
+    """Where layer checkpoints go when they are turned on without a directory: psd_checkpoints/ in the work directory."""
+    return Path(work_dir) / "psd_checkpoints"
+
+
+def checkpoints_from_env():
+    """
+    The checkpoints option of a build set by $PSD_CHECKPOINTS: off unless
+    it is set, True ("1" or "on") for default_checkpoint_dir, or any other
+    value as the checkpoint directory.
+    """
+    env = (os.getenv("PSD_CHECKPOINTS") or "").strip()
+    if env.lower() in ("", "off", "none", "0"):
+        return False
+    return True if env.lower() in ("1", "on") else Path(env)
+
+
+class LayerCheckpoints:
+    """
+    One checkpoint per completed expansion layer.
+
+    layer_<i>/ holds interactions.tsv (the cumulative STRING network the
+    layer was built from) and checkpoint.json with the layer membership and
+    the parameters that produced it: the input file hash, the thresholds of
+    layers 1..i and the STRING settings. Layer i only depends on those, so a
+    run whose thresholds share a prefix with an earlier run can rebuild the
+    matching layers from disk instead of querying STRING again; the stored
+    membership is restored rather than selected again.
+
+    A checkpoint expires after max_age seconds (by default the TTL of the
+    STRING response cache), so a resumed layer never keeps STRING data the
+    response cache would already have fetched again.
+    """
+
+    def __init__(self, directory, input_path, settings=None, max_age=DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.input_sha256 = file_sha256(input_path)
+        self.settings = dict(settings or {})
+        self.max_age = max_age
+
+    def _layer_dir(self, layer):
+        return self.directory / f"layer_{layer}"
+
+    def _params(self, thresholds):
+        return {"format": CHECKPOINT_FORMAT, "input_sha256": self.input_sha256,
+                "thresholds": list(thresholds), "settings": self.settings}
+
+    def load(self, layer, thresholds):
+        """
+        (path of the checkpointed interactions, membership) of layer, or None
+        if there is no valid checkpoint for these parameters.
+        """
+        layer_dir = self._layer_dir(layer)
+        try:
+            with open(layer_dir / "checkpoint.json", encoding="utf-8") as file:
+                checkpoint = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        interactions = layer_dir / "interactions.tsv"
+        if checkpoint.get("params") != self._params(thresholds) or not interactions.exists():
+            return None
+        if not time.time() - checkpoint.get("saved_at", 0) <= self.max_age:
+            print(f"[INFO] Checkpoint of layer {layer} is older than {self.max_age} s; recomputing it")
+            return None
+        membership = checkpoint.get("membership")
+        if (not isinstance(membership, dict) or set(membership) != set(KINDS)
+                or file_sha256(interactions) != checkpoint.get("interactions_sha256")):
+            print(f"[WARN] Checkpoint of layer {layer} is damaged; recomputing it")
+            return None
+        return interactions, membership
+
+    def save(self, layer, thresholds, interactions_path, membership):
+        """Checkpoint layer: a copy of interactions_path plus membership (kind -> names)."""
+        layer_dir = self._layer_dir(layer)
+        layer_dir.mkdir(parents=True, exist_ok=True)
+
+        # checkpoint.json is written last, so a crash never leaves a layer that looks complete
+        (layer_dir / "checkpoint.json").unlink(missing_ok=True)
+        shutil.copyfile(interactions_path, layer_dir / "interactions.tsv")
+        checkpoint = {"layer": layer, "params": self._params(thresholds), "saved_at": time.time(),
+                      "interactions_sha256": file_sha256(layer_dir / "interactions.tsv"),
+                      "membership": membership}
+        temporary = layer_dir / "checkpoint.json.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(checkpoint, file)
+        os.replace(temporary, layer_dir / "checkpoint.json")
+
+    def discard_from(self, layer):
+        """Remove the checkpoints of layer and every deeper layer, which no longer follow from the layers before."""
+        if not self.directory.exists():
+            return
+        for layer_dir in self.directory.glob("layer_*"):
+            suffix = layer_dir.name[len("layer_"):]
+            if suffix.isdigit() and int(suffix) >= layer:
+                shutil.rmtree(layer_dir, ignore_errors=True)
@@ -0,0 +1,59 @@
+# the three layer assignments a run keeps for every protein
+ALL = "all"              # layer of the file a protein first appeared in (was total_proteins_nested_list)
+SELECTIVE = "selective"  # layers picked by main.py's threshold rule (was total_proteins_nested_list_selective)
+NESTED = "nested"        # layers picked by the NestedList rule (was n_l.nested_list)
+KINDS = (ALL, SELECTIVE, NESTED)
+
+
+class LayerIndex:
+    """
+    Protein -> layer map for all three layer assignments of a run.
+
+    One dict keyed by protein name holds the layer number of each kind
+    (None while the protein is not in that assignment), so membership and
+    layer lookups are O(1). The per-layer name lists are kept in insertion
+    order, which is the order the old nested lists had.
+    """
+
+    def __init__(self):
+        # name -> [layer in ALL, layer in SELECTIVE, layer in NESTED]
+        self._layer_of = {}
+        self._layers = {kind: [] for kind in KINDS}
+
+    def copy(self):
+        """An independent LayerIndex with the same layers."""
+        other = LayerIndex()
+        other._layer_of = {name: list(record) for name, record in self._layer_of.items()}
+        other._layers = {kind: [list(layer) for layer in layers] for kind, layers in self._layers.items()}
+        return other
+
+    def add_layer(self, kind, names):
+        """Append the next layer of kind with the names not already in it and return that layer."""
+        slot = KINDS.index(kind)
+        number = len(self._layers[kind])
+        layer = []
+        for name in names:
+            record = self._layer_of.setdefault(name, [None, None, None])
+            if record[slot] is None:
+                record[slot] = number
+                layer.append(name)
+        self._layers[kind].append(layer)
+        return layer
+
+    def layer_of(self, name, kind=ALL):
+        record = self._layer_of.get(name)
+        return None if record is None else record[KINDS.index(kind)]
+
+    def contains(self, name, kind=ALL):
+        return self.layer_of(name, kind) is not None
+
+    def layers(self, kind=ALL):
+        """The layers of kind as a list of name lists (do not modify)."""
+        return self._layers[kind]
+
+    def layer(self, kind, number):
+        return self._layers[kind][number]
+
+    def names(self, kind=ALL):
+        """Every name of kind, layer by layer."""
+        return [name for layer in self._layers[kind] for name in layer]
@@ -0,0 +1,70 @@
+import numpy as np
+from scipy import sparse
+
+
+def adjacency_matrix(table):
+    """Symmetric 0/1 CSR adjacency matrix of the pairs kept in an InteractionTable."""
+    n = len(table.names)
+    rows = np.concatenate([table.source, table.target])
+    cols = np.concatenate([table.target, table.source])
+    adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, n))
+
+    # (A, B) and (B, A) both listed, or a self pair, are still one neighbour
+    adjacency.data[:] = 1
+    return adjacency
+
+
+class LayerSelector:
+    """
+    Layer assignment for one interaction file.
+
+    A protein joins the new layer when it is not in any previous layer and
+    has at least min_int neighbours among the proteins of the previous
+    layers (plus an optional extra reference set). With the adjacency matrix
+    A and a 0/1 membership vector m of the reference proteins, the neighbour
+    counts of every protein in the file are the single product A @ m.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.adjacency = adjacency_matrix(table)
+
+    def membership(self, names):
+        vector = np.zeros(len(self.table.names), dtype=np.int32)
+        ids = [self.table.name_to_id[name] for name in names if name in self.table.name_to_id]
+        vector[ids] = 1
+        return vector
+
+    def neighbour_counts(self, reference_names):
+        return self.adjacency @ self.membership(reference_names)
+
+    def select(self, previous_layers, min_int, extra_reference=()):
+        """
+        Return, in file order, the names of the proteins that form the next
+        layer after previous_layers (a list of lists of names).
+        """
+        return self.select_for_thresholds(previous_layers, [min_int], extra_reference)[min_int]
+
+    def select_for_thresholds(self, previous_layers, thresholds, extra_reference=()):
+        """
+        select for several values of min_int at once: the neighbour counts
+        are computed once and every threshold is answered from them.
+        Returns a dict threshold -> names.
+        """
+        placed = self.membership(name for layer in previous_layers for name in layer)
+
+        # nothing placed yet: every protein of the file is the first layer
+        if not any(previous_layers):
+            everyone = [name for name, p in zip(self.table.names, placed) if not p]
+            return {min_int: list(everyone) for min_int in thresholds}
+
+        reference = placed | self.membership(extra_reference)
+        counts = self.adjacency @ reference
+
+        # the old loops only compared the count after incrementing it,
+        # so a threshold of 0 still needs one neighbour
+        selections = {}
+        for min_int in thresholds:
+            selected = (placed == 0) & (counts >= max(min_int, 1))
+            selections[min_int] = [self.table.names[i] for i in np.flatnonzero(selected)]
+        return selections
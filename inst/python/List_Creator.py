@@ -1,13 +1,13 @@
 from pathlib import Path
-import os
 import combine_files
 import get_files1
 import make_n_l_new_layer_list
 import move_files_to_directory
 from move_files_to_directory import add_tsv_extension
+from Interaction_table import InteractionTable
+from Layer_index import NESTED
+from Run_report import NO_REPORT
 
-# Determine package base directory dynamically
-BASE_DIR = Path(__file__).resolve().parent
 
 def Update_List_using_last_layer_interactions(
     new_list,
@@ -15,41 +15,81 @@ def Update_List_using_last_layer_interactions(
     extension,
     destination_directory,
     new_file_name,
-    n_l
+    layer_index,
+    report=NO_REPORT
 ):
     """
     Update the list of proteins/interactions using the last layer.
-    Ensures that intermediate TSVs are written into BASE_DIR for consistency.
+    The per-protein TSVs are fetched into source_directory, moved to
+    destination_directory and combined into source_directory/new_file_name.
+    Each step is timed as a stage of report (a Run_report.RunReport).
     """
 
     # Step 1: Gather and move files
-    get_files1.get_files_from_list(new_list)
-    files_to_move = add_tsv_extension(new_list)
-    move_files_to_directory.move_files_with_extension(
-        source_directory,
-        destination_directory,
-        extension,
-        files_to_move
-    )
+    with report.stage("fetch_partners"):
+        get_files1.get_files_from_list(new_list, source_directory)
+    with report.stage("move_files"):
+        files_to_move = add_tsv_extension(new_list)
+        move_files_to_directory.move_files_with_extension(
+            source_directory,
+            destination_directory,
+            extension,
+            files_to_move
+        )
 
     # Step 2: Combine moved files into one TSV
-    # Build a full output path under BASE_DIR
-    output_path = BASE_DIR / new_file_name
-    combine_files.search_files(destination_directory, output_path)
+    # (next to the fetched files, so every run keeps them in its own directory)
+    output_path = Path(source_directory) / new_file_name
+    with report.stage("combine"):
+        combine_files.search_files(destination_directory, output_path)
 
     # Step 3: Build new layer list
-    a = make_n_l_new_layer_list.create_whole_list(output_path, n_l)
+    with report.stage("layer_list"):
+        a = make_n_l_new_layer_list.create_whole_list(output_path, layer_index)
 
     # Step 4: Logging and stats
+    print_layer_stats(a, layer_index)
+    print(f"[INFO] Wrote combined list TSV: {output_path}")
+    return a, output_path
+
+
+def Update_List_streaming(new_list, layer_index, destination_directory=None, new_file_path=None,
+                          report=NO_REPORT):
+    """
+    Same layer list as Update_List_using_last_layer_interactions, built in
+    memory: the partner records go straight from the fetcher into an
+    InteractionTable, without writing, moving, combining and re-reading the
+    per-protein TSVs. When destination_directory is given the <PROTEIN>.tsv
+    files (and new_file_path, the combined file) are still written there as a
+    side output. Returns the list and the table.
+    """
+    records = get_files1.iter_partner_records(new_list)
+    if destination_directory is not None:
+        records = get_files1.write_partner_files(records, destination_directory, new_file_path)
+
+    # fetching, parsing and (optionally) writing the partner rows happen in this one loop
+    with report.stage("fetch_partners") as stage:
+        node1, node2, scores = [], [], []
+        for query_name, partner_name, combined_score in records:
+            node1.append(query_name)
+            node2.append(partner_name)
+            scores.append(combined_score)
+        table = InteractionTable.from_columns(node1, node2, scores)
+        stage["rows"] = len(node1)
+
+    with report.stage("layer_list"):
+        a = make_n_l_new_layer_list.create_whole_list_from_table(table, layer_index)
+    print_layer_stats(a, layer_index)
+    return a, table
+
+
+def print_layer_stats(a, layer_index):
     print(make_n_l_new_layer_list.make_list_without_quotes(a))
-    print(f"The number of layers is {len(n_l.nested_list)}")
+    print(f"The number of layers is {len(layer_index.layers(NESTED))}")
 
     c = 0
-    for l in n_l.nested_list:
-        print(f"Proteins in layer {n_l.nested_list.index(l) + 1}: {len(l)}")
+    for number, l in enumerate(layer_index.layers(NESTED)):
+        print(f"Proteins in layer {number + 1}: {len(l)}")
         c += len(l)
     print(len(a) - c)
     print(len(a))
-
-    print(f"[INFO] Wrote combined list TSV: {output_path}")
-    return a, output_path
@@ -0,0 +1,426 @@
+import os
+import shutil
+from pathlib import Path
+
+import Combined_file_creator
+import List_Creator
+import String_api
+from Layer_index import LayerIndex, ALL, SELECTIVE, NESTED, KINDS
+from Layer_checkpoint import LayerCheckpoints, checkpoints_from_env, default_checkpoint_dir
+from Threshold_sweep import ThresholdSweep, parse_grid, write_report
+from Visualize_Protein_Network import generate_random_color, rgb_to_hex
+from Network_cache import invalidate, load_selector, load_table
+from Edge_builder import EdgeBuilder
+from Network_layout import radial_layout, apply_layout
+from Graph_writer import StreamingGraphWriter, EAGER_LAYERS, vis_options
+from Network_export import export_network
+from Run_report import RunReport, NullReport
+
+EXTENSION = ".tsv"
+SCAFFOLD_SIZE = 35  # node size of the scaffold layer
+LAYER_SIZE = 20     # node size of layer 1; deeper layers shrink towards 0
+
+# size and colours of the rendered network
+GRAPH_STYLE = {"height": "600px", "width": "100%", "bgcolor": "#ffffff", "font_color": "black"}
+
+
+def threshold_for_layer(i, min_int_per_layer):
+    """Minimum interactions for layer i (1-based); the last value repeats for deeper layers."""
+    if len(min_int_per_layer) == 0:
+        return 2  # fallback if R somehow failed again
+    if i - 1 < len(min_int_per_layer):
+        return min_int_per_layer[i - 1]
+    return min_int_per_layer[-1]
+
+
+def options_from_env():
+    """
+    The build_network options set through PSD_* environment variables (the
+    way main.py has always been configured); unset variables keep the defaults.
+    """
+    options = {
+        # layers are built in memory from the fetched partner records unless
+        # PSD_STREAM=0 asks for the original file-based pipeline; with
+        # PSD_WRITE_LAYER_FILES=1 the streaming mode still writes directory{i}/
+        # and up_to_layer_{i}.tsv for inspection
+        "stream_layers": os.getenv("PSD_STREAM", "1") != "0",
+        "write_layer_files": os.getenv("PSD_WRITE_LAYER_FILES", "0") == "1",
+        # physics | radial, see NetworkBuild
+        "layout": os.getenv("PSD_LAYOUT", "physics").strip().lower(),
+        # pyvis | stream | layers, see NetworkBuild
+        "renderer": os.getenv("PSD_RENDERER", "pyvis").strip().lower(),
+        "eager_layers": int(os.getenv("PSD_EAGER_LAYERS", str(EAGER_LAYERS))),
+        # PSD_EXPORT=npz also writes <out>.npz (off by default)
+        "export": os.getenv("PSD_EXPORT", "off").strip().lower(),
+        # PSD_REPORT=1 writes per-stage timings to <out>_report.json;
+        # PSD_TRACE_MEMORY=1 adds tracemalloc peaks (slower)
+        "report": os.getenv("PSD_REPORT", "0") == "1",
+        # PSD_CHECKPOINTS=1 (or a directory) checkpoints every layer, see Layer_checkpoint
+        "checkpoints": checkpoints_from_env(),
+        "trace_memory": os.getenv("PSD_TRACE_MEMORY", "0") == "1",
+    }
+    # PSD_SWEEP="1,2,3" (or one list per layer, "2,3;1,2") reports every
+    # combination before the chosen thresholds are rendered
+    if os.getenv("PSD_SWEEP"):
+        options["sweep"] = os.getenv("PSD_SWEEP")
+        options["sweep_report"] = os.getenv("PSD_SWEEP_REPORT") or None
+    return options
+
+
+class NetworkBuild:
+    """
+    State of one PSD network build: the graph, the layer index and the
+    output settings. Nothing is shared between builds except the
+    process-wide caches (parsed files, STRING responses), so a warm
+    interpreter can run any number of them one after another.
+
+    input_tsv is resolved against the directory of out, and a relative out
+    against work_dir (default: the current directory). Options:
+      stream_layers      build layers in memory (False: file-based pipeline)
+      write_layer_files  with stream_layers, still write directory{i}/ and up_to_layer_{i}.tsv
+                         (not for layers resumed from a checkpoint, which fetch nothing)
+      layout             "physics" (browser force simulation) or "radial"
+                         (fixed positions: scaffolds in the centre, one ring per layer)
+      renderer           "pyvis" (one self-contained HTML), "stream" (<out>_data.js
+                         written while the layers are built) or "layers" (one
+                         <out>_layer<k>.js per layer, deeper ones loaded on demand)
+      eager_layers       layers the "layers" page loads up front
+      export             "npz" writes the final network to <out>.npz, "off" (default) skips it
+      checkpoints        True: default_checkpoint_dir(work_dir), a path, or False/None (default) for none
+      report             write the time, memory and size of every stage to <out>_report.json (off by default)
+      trace_memory       with report, also record tracemalloc peaks (slows the build down)
+    """
+
+    def __init__(self, input_tsv, out="main.html", work_dir=None, stream_layers=True,
+                 write_layer_files=False, layout="physics", renderer="pyvis",
+                 eager_layers=EAGER_LAYERS, export="off", checkpoints=False, report=False,
+                 trace_memory=False):
+        self.work_dir = Path(work_dir or Path.cwd()).resolve()
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.out = (self.work_dir / out).resolve()
+        self.base_dir = self.out.parent
+        self.input_path = os.path.join(self.base_dir, input_tsv)
+        self.stream_layers = stream_layers
+        self.write_layer_files = write_layer_files
+        self.layout = layout
+        self.renderer = renderer
+        self.export = export
+
+        # the pyvis Network is only created (and pyvis imported) when rendering
+        self._graph = None
+
+        # protein -> layer for the ALL, SELECTIVE and NESTED assignments of this build
+        self.layer_index = LayerIndex()
+
+        # nodes and edges already emitted (kept for the graph, or streamed to graph_writer)
+        self.graph_writer = None
+        if renderer in ("stream", "layers"):
+            self.graph_writer = StreamingGraphWriter(self.out, GRAPH_STYLE["height"], GRAPH_STYLE["width"],
+                                                     GRAPH_STYLE["bgcolor"], per_layer=renderer == "layers",
+                                                     eager_layers=eager_layers)
+        self.edge_builder = EdgeBuilder(writer=self.graph_writer, font_color=GRAPH_STYLE["font_color"])
+
+        if checkpoints is True:
+            checkpoints = default_checkpoint_dir(self.work_dir)
+        self.checkpoint_dir = checkpoints or None
+        self.checkpoints = None
+        self.thresholds = []
+
+        self.report = NullReport()
+        if report:
+            self.report = RunReport(self.out.with_name(f"{self.out.stem}_report.json"), self.edge_builder,
+                                    trace_memory, input=self.input_path, out=str(self.out),
+                                    stream_layers=stream_layers, write_layer_files=write_layer_files,
+                                    layout=layout, renderer=renderer,
+                                    export=export)
+
+    @property
+    def graph(self):
+        """The pyvis Network of this build (holding its nodes and edges unless they are streamed)."""
+        if self._graph is None:
+            from pyvis.network import Network
+
+            self._graph = Network(notebook=True, cdn_resources="remote", **GRAPH_STYLE)
+            if self.graph_writer is None:
+                self.edge_builder.add_to(self._graph)
+        return self._graph
+
+    def clean_work_dir(self):
+        """
+        Remove the directory{i}/ and up_to_layer*.tsv files of earlier runs
+        from the work directory and from the directory of out, where the
+        layers are written (checkpoints and the input file are kept).
+        """
+        print("[CLEANUP] Removing old directories and TSVs from previous runs...")
+        input_path = Path(self.input_path).resolve()
+        for directory in dict.fromkeys((self.work_dir, self.base_dir)):
+            if not directory.is_dir():
+                continue
+            for item in directory.iterdir():
+                if item.resolve() == input_path:
+                    continue
+                try:
+                    if item.is_dir() and item.name.startswith("directory"):
+                        shutil.rmtree(item, ignore_errors=True)
+                    elif item.is_file() and item.name.startswith("up_to_layer") and item.suffix == EXTENSION:
+                        item.unlink()
+                except Exception as e:
+                    print(f"[CLEANUP] ⚠️ Could not remove {item}: {e}")
+        print("[CLEANUP] ✅ Done.")
+
+    # =========================================================
+    # === LAYERS ===============================================
+    # =========================================================
+    def create_nested_list_of_layers(self, file_path):
+        """Add the proteins that appear for the first time in file_path as the next ALL layer."""
+        self.layer_index.add_layer(ALL, load_table(file_path).names)
+
+    def create_nested_list_of_layers_selective(self, file_path, min_nb_of_int):
+        """Selectively add proteins with minimum number of interactions."""
+        # neighbours are counted in the earlier selective layers and among the
+        # proteins that are new in this file (the last ALL layer)
+        layer_index = self.layer_index
+        new_in_file = layer_index.layers(ALL)[-1] if layer_index.layers(ALL) else []
+        selected = load_selector(file_path).select(layer_index.layers(SELECTIVE), min_nb_of_int, new_in_file)
+        layer_index.add_layer(SELECTIVE, selected)
+
+    def create_nested_list_of_layers_nested(self, file_path, min_nb_of_int):
+        """Add the next NESTED layer (the NestedList rule: neighbours in earlier layers only)."""
+        selected = load_selector(file_path).select(self.layer_index.layers(NESTED), min_nb_of_int)
+        self.layer_index.add_layer(NESTED, selected)
+
+    def restore_layers(self, file_path, membership):
+        """
+        Add the next ALL, SELECTIVE and NESTED layers from a checkpoint's
+        membership (kind -> names) instead of selecting them again; raises
+        ValueError when it does not fit file_path and the layers so far.
+        """
+        layer_index = self.layer_index
+        names = load_table(file_path).names
+        new_in_file = [name for name in names if not layer_index.contains(name, ALL)]
+        known = set(names)
+        if membership.get(ALL) != new_in_file or any(
+                not set(membership.get(kind, ())) <= known
+                or any(layer_index.contains(name, kind) for name in membership.get(kind, ()))
+                for kind in (SELECTIVE, NESTED)):
+            raise ValueError(f"Checkpointed layer membership does not match {file_path}")
+        for kind in KINDS:
+            layer_index.add_layer(kind, membership[kind])
+
+    def extend_graph_selective(self, file_path, s, nb_of_min_int, color=None, membership=None):
+        """
+        Register the next layers from an interaction file (or restore them
+        from a checkpoint's membership) and add its new proteins and edges to the graph.
+        """
+        report = self.report
+        with report.stage("parse") as stage:
+            stage["rows"] = len(load_table(file_path))
+
+        with report.stage("select"):
+            if membership is not None:
+                self.restore_layers(file_path, membership)
+            else:
+                self.create_nested_list_of_layers(file_path)
+                self.create_nested_list_of_layers_selective(file_path, nb_of_min_int)
+                self.create_nested_list_of_layers_nested(file_path, nb_of_min_int)
+
+        with report.stage("graph"):
+            builder = self.edge_builder
+            if builder.writer is not None:
+                builder.writer.start_layer(len(self.layer_index.layers(ALL)) - 1)
+            hex_color = rgb_to_hex(*generate_random_color()) if color is None else color
+            table = load_table(file_path)
+            builder.add_nodes(table.names, shape="dot", size=s, color=hex_color)
+
+            # every edge of a protein seen in an earlier file was added with that
+            # file's scores when its layer was built, so only the proteins that are
+            # new in this file can contribute edges here
+            builder.add_table_edges(table, self.layer_index.layers(ALL)[-1])
+
+    def build_scaffold_layer(self):
+        """Layer 0: the input file itself."""
+        print("[INFO] Building base scaffolds (Layer 0)...")
+        if not os.path.exists(self.input_path):
+            raise FileNotFoundError(f"Input file not found: {self.input_path}")
+
+        self.report.layer = 0
+        self.extend_graph_selective(self.input_path, SCAFFOLD_SIZE, 0)
+        print("[INFO] ✅ Scaffolds layer built and registered as Layer 0.")
+
+        # completed layers are checkpointed against the input file and
+        # everything else that changes what STRING returns
+        if self.checkpoint_dir is not None:
+            settings = {"string_version": String_api.STRING_VERSION, "species": String_api.SPECIES,
+                        "string_dump": os.getenv("PSD_STRING_DUMP") or None}
+            if String_api.api_url_override() is not None:
+                settings["string_api_url"] = String_api.api_url_override()
+            self.checkpoints = LayerCheckpoints(self.checkpoint_dir, self.input_path, settings)
+
+    def expand_one_more_layer(self, i, s, min_int):
+        """Expand graph by one layer and update interaction files; returns the layer's cumulative file."""
+        layer_index = self.layer_index
+        if not layer_index.layers(SELECTIVE):
+            raise IndexError(
+                f"[ERROR] No selective layer found before layer {i}. "
+                f"Ensure scaffold data '{self.input_path}' was loaded properly."
+            )
+
+        last_list = layer_index.layers(SELECTIVE)[-1]
+        directory = os.path.join(self.base_dir, f"directory{i}")
+        report = self.report
+        report.layer = i
+
+        if self.stream_layers:
+            print(f"[DEBUG] Expanding to layer {i} in memory")
+            if self.write_layer_files:
+                os.makedirs(directory, exist_ok=True)
+                a, _ = List_Creator.Update_List_streaming(
+                    last_list, layer_index, directory, self.base_dir / f"up_to_layer_{i + 1}.tsv", report
+                )
+            else:
+                a, _ = List_Creator.Update_List_streaming(last_list, layer_index, report=report)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            print(f"[DEBUG] Expanding to layer {i} | Output dir: {directory}")
+            a, _ = List_Creator.Update_List_using_last_layer_interactions(
+                last_list, self.base_dir, EXTENSION, directory, f"up_to_layer_{i + 1}.tsv", layer_index, report
+            )
+        with report.stage("fetch_network"):
+            cumulative_path = Combined_file_creator.Create_combined_interactions_file(
+                f"up_to_layer{i + 1}_cumulative", a, self.base_dir
+            )
+        self.extend_graph_selective(str(cumulative_path), s, min_int)
+        return cumulative_path
+
+    def resume_one_more_layer(self, i, s, min_int, checkpoint_path, membership):
+        """
+        Rebuild layer i from its checkpointed interactions and membership,
+        without querying STRING; raises ValueError (before changing the
+        build) when the membership does not fit the layers so far.
+        """
+        print(f"[INFO] Resuming layer {i} from checkpoint: {checkpoint_path}")
+        if self.write_layer_files:
+            print(f"[INFO] Layer {i} is resumed, so its directory{i}/ and up_to_layer_{i + 1}.tsv are not written")
+        cumulative_path = self.base_dir / f"up_to_layer{i + 1}_cumulative.tsv"
+        self.report.layer = i
+        with self.report.stage("checkpoint_load"):
+            shutil.copyfile(checkpoint_path, cumulative_path)
+            invalidate(cumulative_path)
+        self.extend_graph_selective(str(cumulative_path), s, min_int, membership=membership)
+
+    def sweep_thresholds(self, n, grid_spec, min_int_per_layer, report_path=None):
+        """
+        Report the layers of every threshold combination in grid_spec (see
+        Threshold_sweep) without rendering any of them; call it after
+        build_scaffold_layer. The report goes to <out>_sweep.json by default.
+        """
+        grid = parse_grid(grid_spec, n)
+        chosen = [threshold_for_layer(i, min_int_per_layer) for i in range(1, n + 1)]
+        print(f"[INFO] Sweeping thresholds {grid} over {n} layers")
+
+        sweep = ThresholdSweep()
+        self.report.layer = None
+        with self.report.stage("sweep"):
+            results = sweep.run(self.layer_index.copy(), grid)
+        report_path = report_path or self.out.with_name(f"{self.out.stem}_sweep.json")
+        return write_report(report_path, grid, results, chosen, sweep.fetches)
+
+    def make_n_layer_graph(self, in_size, n, min_int_per_layer):
+        """Generate an n-layer PSD network on top of the scaffold layer and save it."""
+        s = in_size
+        checkpoints = self.checkpoints
+        print(f"[INFO] Generating {n} layers with thresholds: {min_int_per_layer}")
+
+        # resume from the deepest checkpoint whose thresholds match this build's
+        thresholds = self.thresholds
+        self.report.settings["thresholds"] = thresholds
+        resuming = checkpoints is not None
+        for i in range(1, n + 1):
+            threshold = threshold_for_layer(i, min_int_per_layer)
+            print(f"[LAYER {i}] Using min interactions: {threshold}")
+            thresholds.append(threshold)
+
+            checkpoint = checkpoints.load(i, thresholds) if resuming else None
+            if checkpoint is not None:
+                try:
+                    self.resume_one_more_layer(i, s, threshold, *checkpoint)
+                except ValueError as e:
+                    print(f"[WARN] {e}; recomputing layer {i}")
+                    checkpoint = None
+            if checkpoint is None:
+                if resuming:
+                    checkpoints.discard_from(i)
+                    resuming = False
+                cumulative_path = self.expand_one_more_layer(i, s, threshold)
+                if checkpoints is not None:
+                    with self.report.stage("checkpoint_save"):
+                        checkpoints.save(i, thresholds, cumulative_path,
+                                         {kind: self.layer_index.layers(kind)[-1] for kind in KINDS})
+            s -= in_size / n
+
+        self.report.layer = None
+        with self.report.stage("render"):
+            self.render()
+        if self.export == "npz":
+            with self.report.stage("export"):
+                export_network(self.out.with_suffix(".npz"), self.layer_index, self.edge_builder.edges,
+                               thresholds)
+        print(f"[INFO] ✅ Graph saved to: {self.out}")
+        self.report.write()
+        return str(self.out)
+
+    # =========================================================
+    # === OUTPUT ===============================================
+    # =========================================================
+    def render(self):
+        """
+        Lay the network out if asked to and write the HTML (once, after the
+        last layer). Only the pyvis renderer imports pyvis; the streamed
+        pages get their vis.js options from vis_options.
+        """
+        graph_writer = self.graph_writer
+        physics = True
+        if self.layout == "radial":
+            print("[INFO] Computing radial layer layout...")
+            positions = radial_layout(self.layer_index.layers(ALL), self.edge_builder.edges)
+            if graph_writer is None:
+                apply_layout(self.graph, positions)
+            else:
+                graph_writer.add_positions(positions, self.layer_index.layers(ALL))
+                physics = False
+
+        if graph_writer is None:
+            self.graph.show(str(self.out))
+        else:
+            graph_writer.close(vis_options(physics))
+
+
+def build_network(input_tsv, layers, thresholds, out="main.html", work_dir=None,
+                  sweep=None, sweep_report=None, **options):
+    """
+    Build an n-layer PSD network from input_tsv and write it to out.
+
+    layers is the number of expansion layers and thresholds the minimum
+    number of interactions for layers 1..n (the last value repeats). With
+    sweep (a PSD_SWEEP grid such as "1,2,3"), every threshold combination is
+    reported first. options are the NetworkBuild options. Importing this
+    module does nothing; all state lives in the returned NetworkBuild, whose
+    out is the written HTML file.
+    """
+    thresholds = [int(x) for x in thresholds]
+    build = NetworkBuild(input_tsv, out, work_dir, **options)
+    print(f"[DEBUG] Working directory: {build.work_dir}")
+    print(f"[DEBUG] Output will be saved to: {build.out}")
+    print(f"[INFO] Using per-layer thresholds: {thresholds}")
+
+    build.clean_work_dir()
+    try:
+        build.build_scaffold_layer()
+        if sweep:
+            build.sweep_thresholds(int(layers), sweep, thresholds, sweep_report)
+        build.make_n_layer_graph(LAYER_SIZE, int(layers), thresholds)
+    except Exception:
+        # the stages up to the failure show where the run stopped
+        build.report.write(failed=True)
+        raise
+    return build
@@ -0,0 +1,105 @@
+import os
+from collections import OrderedDict
+
+from File_processor import InteractionProcessor
+from Interaction_table import InteractionTable
+from Layer_selection import LayerSelector
+
+
+def file_signature(path):
+    """What has to stay the same for a cached parse of path to still be valid."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino
+
+
+class NetworkCache:
+    """
+    Process-wide cache of parsed interaction files.
+
+    Every layer reads the same up_to_layer*.tsv from several places
+    (graph extension, the three layer lists, create_whole_list), so the
+    parsed file is kept here and shared between them.
+    Entries are keyed by absolute path and validated against the file's
+    size, mtime, ctime and inode, so a file rewritten by a later run is
+    parsed again. A rewrite of the same size within the filesystem's
+    timestamp granularity can still look unchanged, so the writers of
+    layer files also call invalidate(path).
+
+    Files are read with the columnar InteractionTable loader. The
+    InteractionProcessor (one Protein object per protein) and the
+    LayerSelector are built from the table on first use, so callers that
+    only need names or the selection never create Protein objects.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # path -> [file_signature, table, processor, selector], least recently used first
+        self._entries = OrderedDict()
+
+    def _get(self, file_path):
+        path = os.path.abspath(file_path)
+        signature = file_signature(path)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        table = InteractionTable.from_tsv(path)
+
+        entry = [signature, table, None, None]
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get_processor(self, file_path):
+        entry = self._get(file_path)
+        if entry[2] is None:
+            entry[2] = InteractionProcessor.from_table(entry[1], file_path)
+        return entry[2]
+
+    def get_table(self, file_path):
+        return self._get(file_path)[1]
+
+    def get_selector(self, file_path):
+        entry = self._get(file_path)
+        if entry[3] is None:
+            entry[3] = LayerSelector(entry[1])
+        return entry[3]
+
+    def invalidate(self, file_path):
+        """Forget the parse of file_path, which is about to be or has been rewritten."""
+        self._entries.pop(os.path.abspath(file_path), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+network_cache = NetworkCache()
+
+
+def load_processor(file_path):
+    """Return the processed InteractionProcessor for file_path, parsing it at most once."""
+    return network_cache.get_processor(file_path)
+
+
+def invalidate(file_path):
+    """Drop file_path from the parsed-file cache; writers call it when they rewrite a file."""
+    network_cache.invalidate(file_path)
+
+
+def load_table(file_path):
+    """Return the InteractionTable for file_path, parsing it at most once."""
+    return network_cache.get_table(file_path)
+
+
+def load_selector(file_path):
+    """Return the LayerSelector over file_path's adjacency matrix, building it at most once."""
+    return network_cache.get_selector(file_path)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from Layer_index import ALL, SELECTIVE, NESTED
+
+NOT_IN_LAYER = -1  # layer value of a node that never joined a layer of that kind
+
+
+def export_network(path, layer_index, edges, thresholds=()):
+    """
+    Write the final layered network to a compressed .npz file.
+
+    Arrays (node ids are positions in names, in ALL layer order):
+      names            protein names (unicode, loads without pickle)
+      layer            ALL layer of every node (the layer it is drawn in)
+      layer_selective  SELECTIVE layer, or -1
+      layer_nested     NESTED layer, or -1
+      source, target   int32 node ids of every edge (each edge once)
+      score            float32 combined score of every edge
+      thresholds       minimum interactions used for layers 1..n
+    edges is a dict (name, name) -> score, such as EdgeBuilder.edges.
+    """
+    names = layer_index.names(ALL)
+    node_id = {name: i for i, name in enumerate(names)}
+
+    def layers_of(kind):
+        values = [layer_index.layer_of(name, kind) for name in names]
+        return np.array([NOT_IN_LAYER if v is None else v for v in values], dtype=np.int16)
+
+    pairs = [(node_id[a], node_id[b], score) for (a, b), score in edges.items()
+             if a in node_id and b in node_id]
+    source, target, score = zip(*pairs) if pairs else ((), (), ())
+
+    np.savez_compressed(path,
+                        names=np.array(names, dtype=str),
+                        layer=layers_of(ALL),
+                        layer_selective=layers_of(SELECTIVE),
+                        layer_nested=layers_of(NESTED),
+                        source=np.array(source, dtype=np.int32),
+                        target=np.array(target, dtype=np.int32),
+                        score=np.array(score, dtype=np.float32),
+                        thresholds=np.array(list(thresholds), dtype=np.int32))
+    print(f"[INFO] ✅ Exported {len(names)} nodes and {len(pairs)} edges to: {path}")
+    return path
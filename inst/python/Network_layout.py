@@ -0,0 +1,79 @@
+import numpy as np
+from scipy import sparse
+
+RING_SPACING = 250.0  # distance between consecutive layer rings
+NODE_GAP = 40.0       # arc length kept between neighbouring nodes on a ring
+
+
+def radial_layout(layers, edges, ring_spacing=RING_SPACING, node_gap=NODE_GAP):
+    """
+    Fixed positions for a layered network: layer 0 in the centre and every
+    later layer on the next ring outwards.
+
+    layers is a list of name lists (each name in the first layer it appears
+    in) and edges an iterable of (name, name) pairs. A ring is made wide
+    enough to hold its nodes node_gap apart. Nodes are ordered around their
+    ring by the circular mean angle of their neighbours on the inner rings
+    (barycentric ordering), so edges between layers stay short; nodes
+    without inner neighbours keep their layer order. Returns name -> (x, y).
+    """
+    names = [name for layer in layers for name in layer]
+    index = {name: i for i, name in enumerate(names)}
+    pairs = np.array([(index[a], index[b]) for a, b in edges if a in index and b in index],
+                     dtype=np.int64).reshape(-1, 2)
+    adjacency = sparse.csr_matrix((np.ones(2 * len(pairs)), (np.concatenate([pairs[:, 0], pairs[:, 1]]),
+                                                              np.concatenate([pairs[:, 1], pairs[:, 0]]))),
+                                  shape=(len(names), len(names)))
+
+    angle = np.zeros(len(names))
+    radius = np.zeros(len(names))
+    placed = np.zeros(len(names), dtype=bool)
+    ring = 0.0
+    start = 0
+    for number, layer in enumerate(layers):
+        ids = np.arange(start, start + len(layer))
+        start += len(layer)
+        if len(ids) == 0:
+            continue
+
+        # the centre layer is a single point or a small circle
+        needed = len(ids) * node_gap / (2 * np.pi)
+        if number == 0:
+            ring = needed if len(ids) > 1 else 0.0
+        else:
+            ring = max(ring + ring_spacing, needed)
+
+        # circular mean of the angles of each node's already placed neighbours
+        inner = adjacency[ids] @ sparse.diags(placed.astype(float))
+        pull = np.column_stack([inner @ np.cos(angle), inner @ np.sin(angle)])
+        has_pull = np.hypot(pull[:, 0], pull[:, 1]) > 1e-12
+        target = np.where(has_pull, np.arctan2(pull[:, 1], pull[:, 0]) % (2 * np.pi),
+                          2 * np.pi * np.arange(len(ids)) / len(ids))
+
+        order = np.argsort(target, kind="stable")
+        slots = 2 * np.pi * np.arange(len(ids)) / len(ids)
+
+        # rotate the evenly spaced slots to line up with the targets
+        offset = np.angle(np.exp(1j * (target[order] - slots)).sum()) if has_pull.any() else 0.0
+        angle[ids[order]] = slots + offset
+        radius[ids] = ring
+        placed[ids] = True
+
+    x, y = radius * np.cos(angle), radius * np.sin(angle)
+    return {name: (float(x[i]), float(y[i])) for i, name in enumerate(names)}
+
+
+def apply_layout(graph, positions):
+    """Pin the nodes of a pyvis Network to positions and switch the browser physics off."""
+    for node in graph.nodes:
+        position = positions.get(node["id"])
+        if position is not None:
+            node["x"], node["y"] = position
+            node["physics"] = False
+    disable_physics(graph)
+
+
+def disable_physics(graph):
+    """Turn off the vis.js physics of a pyvis Network, along with the dynamic edge smoothing that relies on it."""
+    graph.toggle_physics(False)
+    graph.options.edges.smooth.enabled = False
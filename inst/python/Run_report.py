@@ -0,0 +1,164 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import String_client
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, the RSS column stays empty
+    resource = None
+
+REPORT_VERSION = 2  # 2: rss_peak_mb renamed to process_rss_peak_mb
+
+# per-stage numbers summed into the per-layer and whole-run totals
+SUMMED = ("wall_s", "cpu_s", "requests", "bytes_fetched", "rows")
+
+
+def process_rss_peak_mb():
+    """
+    Highest resident set size of the whole process so far (ru_maxrss), in MB
+    (None where getrusage is missing). It never goes down, so it is not the
+    memory of any one stage.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class NullReport:
+    """Stands in for a RunReport when nothing is recorded; its stages measure nothing."""
+
+    def __init__(self):
+        self.layer = None
+        self.settings = {}
+
+    @contextmanager
+    def stage(self, name):
+        yield {}
+
+    def write(self, failed=False):
+        return None
+
+
+# default of the functions that take a report; builds get a NullReport of their own
+NO_REPORT = NullReport()
+
+
+class RunReport:
+    """
+    Timings and sizes of every stage of one network build, written as JSON.
+
+    Each `with report.stage(name):` block records, for the layer in
+    report.layer (None for the final render and export):
+      wall_s, cpu_s      wall-clock and CPU time of the stage
+      process_rss_peak_mb
+                         the whole process' peak resident set size so far, read at the
+                         end of the stage (includes everything run before it)
+      traced_peak_mb     highest memory traced by tracemalloc during the stage (only with
+                         trace_memory, which slows the build down)
+      requests,          STRING HTTP answers received and their bytes (cache and
+      bytes_fetched      offline-dump answers cost none)
+      rows               rows parsed, where the stage sets it on the yielded record
+      nodes, edges       size of the network (edge_builder) after the stage
+    Stages do not nest. write() adds per-layer and whole-run totals.
+    """
+
+    def __init__(self, path, edge_builder, trace_memory=False, **settings):
+        self.path = path
+        self.edge_builder = edge_builder
+        self.settings = settings
+        self.layer = None
+        self.stages = []
+        self.started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.trace_memory = trace_memory
+
+        # tracing started here is stopped by write(), so a warm interpreter is not left slowed down
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the enclosed block as stage name of the current layer; yields its record."""
+        record = {"layer": self.layer, "stage": name}
+        requests_before, bytes_before = String_client.transfer_totals()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+            requests_after, bytes_after = String_client.transfer_totals()
+            self.stages.append({
+                "layer": record.pop("layer"),
+                "stage": record.pop("stage"),
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+                "process_rss_peak_mb": process_rss_peak_mb(),
+                "traced_peak_mb": (round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)
+                                   if self.trace_memory else None),
+                "requests": requests_after - requests_before,
+                "bytes_fetched": bytes_after - bytes_before,
+                "rows": record.pop("rows", None),
+                "nodes": len(self.edge_builder.nodes),
+                "edges": len(self.edge_builder.edges),
+                **record,
+            })
+
+    @staticmethod
+    def summarize(stages):
+        """Totals of a list of stage records: summed timings and counts, the largest peaks, the final size."""
+        summary = {key: sum(stage[key] or 0 for stage in stages) for key in SUMMED}
+        summary["wall_s"] = round(summary["wall_s"], 6)
+        summary["cpu_s"] = round(summary["cpu_s"], 6)
+        for key in ("process_rss_peak_mb", "traced_peak_mb"):
+            peaks = [stage[key] for stage in stages if stage[key] is not None]
+            summary[key] = max(peaks) if peaks else None
+        summary["nodes"] = stages[-1]["nodes"] if stages else 0
+        summary["edges"] = stages[-1]["edges"] if stages else 0
+        return summary
+
+    def write(self, failed=False):
+        """Write the report to path and return the path."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+            self.trace_memory = False
+
+        layers = []
+        # layers in build order, then the stages outside any layer (sweep, render, export)
+        order = sorted(set(stage["layer"] for stage in self.stages), key=lambda layer: (layer is None, layer or 0))
+        for layer in order:
+            layer_stages = [stage for stage in self.stages if stage["layer"] == layer]
+            layers.append({"layer": layer, "stages": [stage["stage"] for stage in layer_stages],
+                           **self.summarize(layer_stages)})
+
+        report = {
+            "report": "psd_run",
+            "version": REPORT_VERSION,
+            "started": self.started,
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "failed": failed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": self.settings,
+            "trace_memory": any(stage["traced_peak_mb"] is not None for stage in self.stages),
+            "stages": self.stages,
+            "layers": layers,
+            "total": self.summarize(self.stages),
+        }
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+        print(f"[INFO] ✅ Run report ({len(self.stages)} stages) written to: {self.path}")
+        return self.path
@@ -0,0 +1,183 @@
+import os
+import time
+
+import String_cache
+import String_client
+import String_offline
+
+STRING_API_URL = "https://string-db.org/api"
+STRING_VERSION = "12.0"
+OUTPUT_FORMAT = "tsv-no-header"
+SPECIES = 9606  # human
+CLAIM_POLL = 0.5  # seconds between looks for partners another process is fetching
+
+
+def api_url(version=None):
+    """
+    Base URL of the current STRING API, or of an archived version such as
+    "11.5". $PSD_STRING_API_URL replaces it for every version, e.g. to point
+    the fetchers at a local stand-in (benchmarks/string_server.py).
+    """
+    override = api_url_override()
+    if override is not None:
+        return override
+    if version is None:
+        return STRING_API_URL
+    return f"https://version-{version.replace('.', '-')}.string-db.org/api"
+
+
+def api_url_override():
+    """$PSD_STRING_API_URL without a trailing slash, or None when the public API is used."""
+    url = os.getenv("PSD_STRING_API_URL")
+    return url.strip().rstrip("/") if url and url.strip() else None
+
+
+def cache_version(version=None):
+    """
+    The version responses are cached under; answers from another API
+    base URL are kept apart from the public API's.
+    """
+    version = version or STRING_VERSION
+    override = api_url_override()
+    return version if override is None else f"{version}@{override}"
+
+
+def query(method, identifiers, species=SPECIES, limit=None, caller_identity="PSDExplorer",
+          version=None, **params):
+    """
+    POST identifiers to a STRING API method ("network", "interaction_partners")
+    and return the tsv-no-header response text. Extra keyword arguments
+    (e.g. required_score) are sent as request parameters.
+
+    Responses are read through the persistent String_cache, so asking for
+    the same method / species / limit / identifier set again costs no
+    network round trip. Requests go through the shared String_client
+    (keep-alive pool, timeouts, retries with backoff, rate limiting); the
+    last error is raised if they keep failing, and failures are not cached.
+    When $PSD_STRING_DUMP names an offline index (String_offline), the
+    query is answered from it and nothing is sent over the network.
+    """
+    identifiers = list(identifiers)
+    offline = String_offline.offline_index()
+    if offline is not None:
+        return offline.query(method, identifiers, limit, species=species, **params)
+
+    cache = String_cache.default_cache()
+    key = String_cache.StringResponseCache.make_key(method, species, cache_version(version), limit,
+                                                    identifiers, **params)
+    if cache is not None:
+        text = cache.get(key)
+        if text is not None:
+            return text
+
+    text = _post(method, identifiers, species, limit, caller_identity, version, params)
+
+    if cache is not None:
+        cache.put(key, text, method)
+    return text
+
+
+def _post(method, identifiers, species, limit, caller_identity, version, params):
+    data = {
+        "identifiers": "%0d".join(identifiers),
+        "species": species,
+        "caller_identity": caller_identity,
+    }
+    if limit is not None:
+        data["limit"] = limit
+    data.update(params)
+
+    return String_client.default_client().post("/".join([api_url(version), OUTPUT_FORMAT, method]), data)
+
+
+def query_partners(identifiers, species=SPECIES, limit=None, caller_identity="PSDExplorer",
+                   version=None, **params):
+    """
+    query("interaction_partners", ...) cached per protein instead of per
+    identifier list.
+
+    Each protein's partners are stored as their own cache entry, so any
+    later list containing it (another chunk, layer or seed) reuses them and
+    only the proteins never seen before are sent to STRING. Processes
+    sharing the cache file claim the proteins they fetch; a protein another
+    process is already fetching is waited for rather than downloaded twice.
+    """
+    identifiers = list(dict.fromkeys(identifiers))
+    cache = String_cache.default_cache()
+    if cache is None or String_offline.offline_index() is not None:
+        return query("interaction_partners", identifiers, species, limit, caller_identity, version, **params)
+
+    keys = {identifier: String_cache.StringResponseCache.make_key(
+                "interaction_partners", species, cache_version(version), limit, [identifier], **params)
+            for identifier in identifiers}
+    texts = {}
+    for identifier in identifiers:
+        text = cache.get(keys[identifier])
+        if text is not None:
+            texts[identifier] = text
+    missing = [identifier for identifier in identifiers if identifier not in texts]
+
+    claimed = set(cache.claim([keys[identifier] for identifier in missing]))
+    mine = [identifier for identifier in missing if keys[identifier] in claimed]
+
+    # another process may have stored and released some of them since the lookup above
+    for identifier in list(mine):
+        text = cache.get(keys[identifier])
+        if text is not None:
+            texts[identifier] = text
+            mine.remove(identifier)
+            cache.release([keys[identifier]])
+    others = [identifier for identifier in missing if keys[identifier] not in claimed]
+    unattributed = ""
+    try:
+        if mine:
+            fetched, unattributed = _fetch_partners_per_protein(mine, keys, cache, species, limit,
+                                                                caller_identity, version, params)
+            texts.update(fetched)
+    finally:
+        cache.release([keys[identifier] for identifier in mine])
+
+    # proteins claimed by another process: wait for its answer, and fetch
+    # them here if it never arrives
+    deadline = time.monotonic() + String_cache.CLAIM_TIMEOUT
+    while others and time.monotonic() < deadline:
+        time.sleep(CLAIM_POLL)
+        for identifier in list(others):
+            text = cache.get(keys[identifier])
+            if text is not None:
+                texts[identifier] = text
+                others.remove(identifier)
+    if others:
+        fetched, late = _fetch_partners_per_protein(others, keys, cache, species, limit,
+                                                    caller_identity, version, params)
+        texts.update(fetched)
+        unattributed += late
+
+    return "".join(texts.get(identifier, "") for identifier in identifiers) + unattributed
+
+
+def _fetch_partners_per_protein(identifiers, keys, cache, species, limit, caller_identity, version, params):
+    """
+    Fetch identifiers in one request and cache the rows of each query
+    protein (preferredName_A) under its own key. Returns the per-protein
+    texts and the rows that matched none of the identifiers.
+    """
+    text = _post("interaction_partners", identifiers, species, limit, caller_identity, version, params)
+    rows_per_protein = {}
+    for line in text.splitlines(keepends=True):
+        parts = line.split("\t")
+        if len(parts) >= 6:
+            rows_per_protein.setdefault(parts[2], []).append(line if line.endswith("\n") else line + "\n")
+
+    texts = {}
+    unattributed = "".join("".join(rows) for name, rows in rows_per_protein.items() if name not in keys)
+    for identifier in identifiers:
+        rows = rows_per_protein.get(identifier)
+
+        # STRING may answer under another preferred name; an empty entry
+        # would then hide that protein's partners from later runs
+        if rows is None and unattributed:
+            continue
+        texts[identifier] = "".join(rows or [])
+        cache.put(keys[identifier], texts[identifier], "interaction_partners")
+    return texts, unattributed
@@ -0,0 +1,133 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+DEFAULT_TTL = 30 * 24 * 3600             # seconds a response stays valid
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024    # compressed bytes kept before LRU eviction
+CLAIM_TIMEOUT = 300                      # seconds before another process may take over a claimed fetch
+
+
+def default_cache_path():
+    """
+    Location of the response cache: $PSD_CACHE if set ("off" disables the
+    cache), otherwise string_cache.sqlite in the user cache directory.
+    """
+    env = os.getenv("PSD_CACHE")
+    if env:
+        return None if env.strip().lower() in ("off", "none", "0") else Path(env)
+
+    root = os.getenv("XDG_CACHE_HOME") or os.getenv("LOCALAPPDATA") or Path.home() / ".cache"
+    return Path(root) / "PSDExplorer" / "string_cache.sqlite"
+
+
+class StringResponseCache:
+    """
+    SQLite file holding raw STRING API responses.
+
+    Entries are keyed by method, species, STRING version, limit and the set
+    of identifiers, expire after ttl seconds, and the least recently used
+    ones are dropped once the stored (zlib-compressed) bodies exceed
+    max_bytes. Each call opens its own connection (closed when the call
+    returns), so fetcher threads and separate processes can share one file. Processes that want the same
+    entry coordinate through claim / release, so it is fetched only once.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+                                key TEXT PRIMARY KEY,
+                                method TEXT,
+                                created REAL,
+                                accessed REAL,
+                                size INTEGER,
+                                body BLOB)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS claims (
+                                key TEXT PRIMARY KEY,
+                                claimed REAL)""")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """A connection for one transaction: committed (or rolled back on error), then closed."""
+        with contextlib.closing(sqlite3.connect(str(self.path), timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    @staticmethod
+    def make_key(method, species, version, limit, identifiers, **params):
+        identity = {"method": method, "species": species, "version": version, "limit": limit,
+                    "identifiers": sorted(set(identifiers)), "params": params}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT created, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return zlib.decompress(row[1]).decode("utf-8")
+
+    def put(self, key, text, method=""):
+        body = zlib.compress(text.encode("utf-8"))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, method, now, now, len(body), sqlite3.Binary(body)))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def claim(self, keys):
+        """Claim the fetch of keys; returns the ones no other process is fetching (now yours to put and release)."""
+        now = time.time()
+        claimed = []
+        with self._connect() as conn:
+            conn.execute("DELETE FROM claims WHERE claimed < ?", (now - CLAIM_TIMEOUT,))
+            for key in keys:
+                if conn.execute("INSERT OR IGNORE INTO claims VALUES (?, ?)", (key, now)).rowcount:
+                    claimed.append(key)
+        return claimed
+
+    def release(self, keys):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM claims WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM claims")
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The shared cache at default_cache_path(), or None when caching is off."""
+    global _default_cache
+    path = default_cache_path()
+    if path is None:
+        return None
+    if _default_cache is None or _default_cache.path != path:
+        _default_cache = StringResponseCache(path)
+    return _default_cache
@@ -0,0 +1,150 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# responses worth retrying: rate limited or a transient server error
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Spaces request starts at least 1 / per_second seconds apart across all threads."""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class StringClient:
+    """
+    HTTP client shared by every STRING fetcher.
+
+    One keep-alive requests.Session (connection pool of pool_size) is reused
+    for all calls. Each POST gets a (connect, read) timeout and goes through
+    the client-side rate limiter. Connection errors, timeouts, 429 and 5xx
+    responses are retried with exponential backoff and full jitter (honouring
+    Retry-After); the last error is raised once the retries run out. With
+    hedge_after set, a request still running after that many seconds is
+    sent a second time and whichever answer arrives first is used.
+
+    requests is imported when the first client is created, so runs answered
+    from the cache or an offline dump never load the HTTP stack.
+    """
+
+    def __init__(self, timeout=(10, 120), retries=5, backoff=1.0, max_backoff=60.0,
+                 rate=1.0, hedge_after=None, pool_size=8):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.limiter = RateLimiter(rate)
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hedges = ThreadPoolExecutor(max_workers=pool_size) if hedge_after else None
+
+        # answers received (every attempt, retried ones included) and their body bytes
+        self._counter_lock = threading.Lock()
+        self.requests_sent = 0
+        self.bytes_received = 0
+
+    def post(self, url, data):
+        """POST data to url and return the response text, retrying transient failures."""
+        import requests
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                response = self._send(url, data)
+                self._count(response)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.text
+                error = requests.HTTPError(f"{response.status_code} from {url}", response=response)
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt == self.retries:
+                raise error
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            if retry_after and retry_after.strip().isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"[WARN] STRING request failed ({error}); retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _count(self, response):
+        with self._counter_lock:
+            self.requests_sent += 1
+            self.bytes_received += len(response.content)
+
+    def _attempt(self, url, data):
+        self.limiter.wait()
+        return self.session.post(url, data=data, timeout=self.timeout)
+
+    def _send(self, url, data):
+        if self._hedges is None:
+            return self._attempt(url, data)
+
+        pending = {self._hedges.submit(self._attempt, url, data)}
+        done, pending = wait(pending, timeout=self.hedge_after)
+        if not done:
+            pending.add(self._hedges.submit(self._attempt, url, data))
+
+        # first successful answer wins; the slower request is left to finish
+        error = None
+        while pending or done:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        raise error
+
+
+_client = None
+
+
+def default_client():
+    """
+    The process-wide StringClient, configured from $PSD_HTTP_TIMEOUT (read
+    timeout, seconds), $PSD_HTTP_RETRIES, $PSD_RATE_LIMIT (requests per
+    second, 0 = unlimited; Batch_runner splits it between its worker
+    processes) and $PSD_HEDGE_AFTER (seconds, unset = no hedging).
+    """
+    global _client
+    if _client is None:
+        hedge_after = os.getenv("PSD_HEDGE_AFTER")
+        _client = StringClient(timeout=(10, float(os.getenv("PSD_HTTP_TIMEOUT", "120"))),
+                               retries=int(os.getenv("PSD_HTTP_RETRIES", "5")),
+                               rate=float(os.getenv("PSD_RATE_LIMIT", "1")),
+                               hedge_after=float(hedge_after) if hedge_after else None)
+    return _client
+
+
+def transfer_totals():
+    """(requests, bytes) the process-wide client has received so far; (0, 0) before its first request."""
+    if _client is None:
+        return 0, 0
+    return _client.requests_sent, _client.bytes_received
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# score channels of protein.links.detailed, in file order; the API reports
+# them after combined_score as nscore, fscore, pscore, ascore, escore, dscore, tscore
+CHANNELS = ["neighborhood", "fusion", "cooccurence", "coexpression",
+            "experimental", "database", "textmining", "combined_score"]
+COMBINED = CHANNELS.index("combined_score")
+DEFAULT_REQUIRED_SCORE = 400  # STRING's default "medium confidence"
+CHUNK_ROWS = 1_000_000
+
+
+def _open_text(path):
+    return gzip.open(path, "rt", encoding="utf-8") if str(path).endswith(".gz") else open(path, encoding="utf-8")
+
+
+def _read_chunks(handle):
+    """The lines of a text handle, CHUNK_ROWS at a time (the header line is skipped)."""
+    handle.readline()
+    while True:
+        lines = [line for _, line in zip(range(CHUNK_ROWS), handle)]
+        if not lines:
+            return
+        yield lines
+
+
+def _columns(lines, delimiter, usecols, dtype):
+    return np.loadtxt(lines, delimiter=delimiter, usecols=usecols, dtype=dtype, comments=None, ndmin=2)
+
+
+def build_index(links_path, info_path, index_dir):
+    """
+    Build the offline index from a STRING protein.links.detailed /
+    protein.info file pair (plain or .gz) into index_dir.
+
+    Proteins are numbered by their sorted STRING ids; the links become a CSR
+    adjacency (indptr, indices) whose rows are sorted by descending
+    combined score, with the eight uint16 score channels per edge. Every
+    array is a plain .npy file, so OfflineString can memory-map it.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    with _open_text(info_path) as handle:
+        info = np.concatenate([_columns(lines, "\t", (0, 1), str) for lines in _read_chunks(handle)])
+    order = np.argsort(info[:, 0])
+    string_ids, names = info[order, 0], info[order, 1]
+
+    sources, targets, scores = [], [], []
+    with _open_text(links_path) as handle:
+        for lines in _read_chunks(handle):
+            # only the two ids are read as text; the score channels are parsed straight to integers
+            ids = _columns(lines, " ", (0, 1), str)
+            channels = _columns(lines, " ", tuple(range(2, 2 + len(CHANNELS))), np.uint16)
+            source = np.searchsorted(string_ids, ids[:, 0])
+            target = np.searchsorted(string_ids, ids[:, 1])
+            source[source == len(string_ids)] = 0
+            target[target == len(string_ids)] = 0
+            known = (string_ids[source] == ids[:, 0]) & (string_ids[target] == ids[:, 1])
+            sources.append(source[known])
+            targets.append(target[known])
+            scores.append(channels[known])
+    source = np.concatenate(sources + targets).astype(np.int64)
+    target = np.concatenate(targets + sources).astype(np.int64)
+    score = np.concatenate(scores + scores)
+
+    # the dump lists both directions; keep one row per directed pair
+    _, unique_rows = np.unique(source * len(string_ids) + target, return_index=True)
+    source, target, score = source[unique_rows], target[unique_rows], score[unique_rows]
+
+    order = np.lexsort((-score[:, COMBINED].astype(np.int32), source))
+    indptr = np.zeros(len(string_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=len(string_ids)), out=indptr[1:])
+
+    np.save(index_dir / "string_ids.npy", string_ids)
+    np.save(index_dir / "names.npy", names)
+    np.save(index_dir / "indptr.npy", indptr)
+    np.save(index_dir / "indices.npy", target[order].astype(np.int32))
+    np.save(index_dir / "scores.npy", score[order])
+    with open(index_dir / "meta.json", "w") as meta:
+        json.dump({"links": os.path.basename(links_path), "info": os.path.basename(info_path),
+                   "proteins": len(string_ids), "edges": int(len(order) // 2)}, meta)
+    return index_dir
+
+
+class OfflineString:
+    """
+    Answers the STRING "interaction_partners" and "network" API methods from
+    an index made by build_index, returning the same 13-column
+    tsv-no-header rows the web API sends (stringId_A, stringId_B,
+    preferredName_A, preferredName_B, ncbiTaxonId, score, nscore, fscore,
+    pscore, ascore, escore, dscore, tscore). A dump covers the species of
+    its STRING ids only; asking for another one is an error.
+    """
+
+    def __init__(self, index_dir):
+        index_dir = Path(index_dir)
+        self.index_dir = index_dir
+        self.string_ids = np.load(index_dir / "string_ids.npy", mmap_mode="r")
+        self.names = np.load(index_dir / "names.npy", mmap_mode="r")
+        self.indptr = np.load(index_dir / "indptr.npy", mmap_mode="r")
+        self.indices = np.load(index_dir / "indices.npy", mmap_mode="r")
+        self.scores = np.load(index_dir / "scores.npy", mmap_mode="r")
+
+        # NCBI taxon ids the dump covers (the prefix of every STRING id)
+        self.species = {str(string_id).split(".", 1)[0] for string_id in self.string_ids}
+
+        # identifiers may be preferred names or STRING ids
+        self.lookup = {str(name): i for i, name in reversed(list(enumerate(self.names)))}
+        self.lookup.update((str(string_id), i) for i, string_id in enumerate(self.string_ids))
+
+    def resolve(self, identifiers):
+        """Protein numbers of the known identifiers, in order and without repeats."""
+        seen = {}
+        for identifier in identifiers:
+            number = self.lookup.get(identifier)
+            if number is not None:
+                seen.setdefault(number, None)
+        return list(seen)
+
+    def _row(self, a, b, edge):
+        string_a, string_b = str(self.string_ids[a]), str(self.string_ids[b])
+        channels = self.scores[edge]
+        values = [channels[COMBINED]] + [channels[c] for c in range(COMBINED)]
+        return "\t".join([string_a, string_b, str(self.names[a]), str(self.names[b]),
+                          string_a.split(".", 1)[0]] + [format(v / 1000, "g") for v in values])
+
+    def interaction_partners(self, identifiers, limit=None, required_score=DEFAULT_REQUIRED_SCORE):
+        rows = []
+        for a in self.resolve(identifiers):
+            start, stop = int(self.indptr[a]), int(self.indptr[a + 1])
+            strong = np.flatnonzero(self.scores[start:stop, COMBINED] >= required_score)
+            for edge in (start + strong[:limit] if limit is not None else start + strong):
+                rows.append(self._row(a, int(self.indices[edge]), edge))
+        return "\n".join(rows) + "\n" if rows else ""
+
+    def network(self, identifiers, required_score=DEFAULT_REQUIRED_SCORE):
+        members = self.resolve(identifiers)
+        wanted = np.zeros(len(self.string_ids), dtype=bool)
+        wanted[members] = True
+        rows = []
+        for a in members:
+            start, stop = int(self.indptr[a]), int(self.indptr[a + 1])
+            partners = self.indices[start:stop]
+
+            # each edge once, from its lower-numbered end
+            keep = (partners > a) & wanted[partners] & (self.scores[start:stop, COMBINED] >= required_score)
+            for edge in start + np.flatnonzero(keep):
+                rows.append(self._row(a, int(self.indices[edge]), edge))
+        return "\n".join(rows) + "\n" if rows else ""
+
+    def query(self, method, identifiers, limit=None, required_score=DEFAULT_REQUIRED_SCORE, species=None):
+        if species is not None and str(species) not in self.species:
+            raise ValueError(f"[ERROR] Offline STRING index {self.index_dir} has no species {species} "
+                             f"(it covers {', '.join(sorted(self.species))})")
+        if method == "interaction_partners":
+            return self.interaction_partners(identifiers, limit, int(required_score))
+        if method == "network":
+            return self.network(identifiers, int(required_score))
+        raise ValueError(f"[ERROR] Offline STRING index cannot answer method '{method}'")
+
+
+_offline = None
+
+
+def offline_index():
+    """The OfflineString for $PSD_STRING_DUMP (an index directory), or None when offline mode is off."""
+    global _offline
+    index_dir = os.getenv("PSD_STRING_DUMP")
+    if not index_dir:
+        return None
+    if _offline is None or _offline.index_dir != Path(index_dir):
+        _offline = OfflineString(index_dir)
+    return _offline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline STRING index from a bulk download.")
+    parser.add_argument("links", help="protein.links.detailed file (.txt or .txt.gz)")
+    parser.add_argument("info", help="protein.info file (.txt or .txt.gz)")
+    parser.add_argument("index_dir", help="directory to write the index to")
+    args = parser.parse_args()
+    build_index(args.links, args.info, args.index_dir)
+    print(f"[INFO] ✅ Offline STRING index written to: {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
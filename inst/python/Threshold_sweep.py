@@ -0,0 +1,110 @@
+import json
+
+import Combined_file_creator
+import List_Creator
+from Interaction_table import InteractionTable
+from Layer_index import ALL, SELECTIVE, NESTED, KINDS
+from Layer_selection import LayerSelector
+
+
+def parse_grid(spec, n):
+    """
+    Per-layer candidate thresholds for n layers from a PSD_SWEEP value:
+    "1,2,3" tries the same values at every layer, "2,3;1,2;1" gives one
+    list per layer (the last list is reused for deeper layers).
+    """
+    per_layer = [[int(x) for x in part.split(",") if x.strip().isdigit()] for part in spec.split(";")]
+    per_layer = [values for values in per_layer if values]
+    if not per_layer:
+        raise ValueError(f"[ERROR] PSD_SWEEP '{spec}' has no thresholds")
+    return [list(dict.fromkeys(per_layer[min(i, len(per_layer) - 1)])) for i in range(n)]
+
+
+def fetch_layer_table(last_list, layer_index):
+    """The cumulative network of the next layer after layer_index, fetched from STRING into memory."""
+    a, _ = List_Creator.Update_List_streaming(last_list, layer_index)
+    node1, node2, scores = [], [], []
+    for name_a, name_b, combined_score in Combined_file_creator.network_records(a):
+        node1.append(name_a)
+        node2.append(name_b)
+        scores.append(combined_score)
+    return InteractionTable.from_columns(node1, node2, scores)
+
+
+class ThresholdSweep:
+    """
+    Layer sizes and memberships for every combination of per-layer
+    thresholds, in one run.
+
+    Layer i only depends on the thresholds of layers 1..i, so the
+    combinations form a tree of threshold prefixes. Each node of the tree
+    fetches its frontier once and computes the neighbour counts once; every
+    candidate threshold is then read off those counts. Thresholds that pick
+    the same layer (0 and 1 always do) share one subtree, and frontiers that
+    were already fetched are reused from memory.
+    """
+
+    def __init__(self, fetch_layer=fetch_layer_table):
+        self.fetch_layer = fetch_layer
+        self._tables = {}
+
+    def _table(self, layer_index):
+        # what the fetch depends on: the frontier and the names the nested layers add
+        frontier = layer_index.layers(SELECTIVE)[-1]
+        key = (tuple(frontier), tuple(layer_index.names(NESTED)))
+        if key not in self._tables:
+            self._tables[key] = self.fetch_layer(frontier, layer_index)
+        return self._tables[key]
+
+    @property
+    def fetches(self):
+        return len(self._tables)
+
+    def run(self, layer_index, grid):
+        """
+        Expand layer_index (which already holds layer 0) by len(grid) layers
+        for every combination of grid[0] x grid[1] x ... and return one
+        result per combination: {"thresholds", "layers"}, where "layers" has
+        the size and names of every kind for each new layer.
+        """
+        return [{"thresholds": thresholds, "layers": layers}
+                for thresholds, layers in self._expand(layer_index, grid)]
+
+    def _expand(self, layer_index, grid):
+        if not grid:
+            return [([], [])]
+
+        table = self._table(layer_index)
+        selector = LayerSelector(table)
+        new_in_file = [name for name in table.names if not layer_index.contains(name, ALL)]
+        selective = selector.select_for_thresholds(layer_index.layers(SELECTIVE), grid[0], new_in_file)
+        nested = selector.select_for_thresholds(layer_index.layers(NESTED), grid[0])
+
+        # thresholds that produce the same layer lead to the same subtree
+        outcomes = {}
+        for min_int in grid[0]:
+            outcomes.setdefault((tuple(selective[min_int]), tuple(nested[min_int])), []).append(min_int)
+
+        results = []
+        for (selected, nested_selected), thresholds in outcomes.items():
+            child = layer_index.copy()
+            child.add_layer(ALL, table.names)
+            child.add_layer(SELECTIVE, selected)
+            child.add_layer(NESTED, nested_selected)
+            layer = {kind: {"size": len(child.layers(kind)[-1]), "names": child.layers(kind)[-1]}
+                     for kind in KINDS}
+
+            deeper = self._expand(child, grid[1:])
+            for min_int in thresholds:
+                results.extend(([min_int] + suffix, [layer] + layers) for suffix, layers in deeper)
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+def write_report(path, grid, results, chosen, fetches):
+    report = {"grid": grid, "chosen": chosen, "frontiers_fetched": fetches,
+              "configurations": results}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=1)
+    print(f"[INFO] ✅ Threshold sweep of {len(results)} configurations written to: {path}")
+    return path
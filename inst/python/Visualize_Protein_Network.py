@@ -1,8 +1,3 @@
-from pyvis.network import Network
-from File_processor import InteractionProcessor
-import random
-
-from Protein_attributes import Protein
 import random
 
 
@@ -18,13 +13,15 @@ def rgb_to_hex(red, green, blue):
 
 
 # Example usage
-random_color = generate_random_color()
-hex_color = rgb_to_hex(*random_color)
-#print(hex_color)
+if __name__ == "__main__":
+    random_color = generate_random_color()
+    hex_color = rgb_to_hex(*random_color)
+    #print(hex_color)
 
 
 class NetworkVisualizer:
     def __init__(self, proteins):
+        from pyvis.network import Network
 
         self.proteins = proteins
         self.network = Network(notebook=True, cdn_resources="remote", height="600px", width="100%", bgcolor="#ffffff",
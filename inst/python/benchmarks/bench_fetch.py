@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Fetch benchmark against the local STRING stand-in (string_server.py).
+
+Starts the stand-in in this process, points the fetchers at it through
+$PSD_STRING_API_URL and times the two ways a layer talks to STRING:
+"partners" (get_files1: the best partners of every protein) and "network"
+(Combined_file_creator: the interactions among them), first with an empty
+response cache and then again warm. Every phase records the requests,
+status codes and bytes the stand-in saw, so retries under the fault
+options show up next to the timings.
+
+    python benchmarks/bench_fetch.py --synthetic 100000 --proteins 500 --output fetch.json
+    python benchmarks/bench_fetch.py --synthetic 100000 --latency 0.1 --p5xx 0.05 --truncate 0.02 --truncate-mode drop
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from string_server import StringStandIn, add_fault_arguments, faults_from_args, load_network  # noqa: E402
+
+
+def pick_proteins(network, count, seed=0):
+    """count proteins of network in a seeded random order (all of them when there are fewer)."""
+    names = [str(name) for name in network.names]
+    return random.Random(seed).sample(names, min(count, len(names)))
+
+
+def timed_phase(stand_in, name, function):
+    """Run function, returning its timings and what the stand-in served meanwhile."""
+    stand_in.reset_stats()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        error = None
+        try:
+            function()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    phase = {"phase": name, "wall_s": wall, "cpu_s": cpu, "server": stand_in.stats()}
+    if error is not None:
+        phase["error"] = error
+    return phase
+
+
+def run_benchmark(stand_in, proteins, work_dir):
+    # imported here so the clients are created with the environment set in main()
+    import Combined_file_creator
+    import get_files1
+
+    phases = []
+    for warmth in ("cold", "warm"):
+        directory = Path(work_dir) / warmth
+        directory.mkdir()
+        phases.append(timed_phase(stand_in, f"partners_{warmth}",
+                                  lambda: get_files1.get_files_from_list(proteins, directory)))
+        phases.append(timed_phase(stand_in, f"network_{warmth}",
+                                  lambda: Combined_file_creator.Create_combined_interactions_file(
+                                      "network", proteins, directory=directory)))
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the STRING fetchers against a local stand-in.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index", help="offline STRING index directory (String_offline)")
+    source.add_argument("--tsv", help="13-column interaction TSV to serve")
+    source.add_argument("--synthetic", type=int, help="serve a generated scale-free network with this many edges")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated network and of the protein pick")
+    parser.add_argument("--proteins", type=int, default=200, help="proteins to fetch")
+    parser.add_argument("--workers", type=int, help="$PSD_FETCH_WORKERS for the run")
+    parser.add_argument("--chunk-size", type=int, help="$PSD_FETCH_CHUNK_SIZE for the run")
+    parser.add_argument("--rate-limit", type=float, default=0, help="client $PSD_RATE_LIMIT (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=5, help="client $PSD_HTTP_RETRIES")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    network = load_network(args.index, args.tsv, args.synthetic, args.seed)
+    proteins = pick_proteins(network, args.proteins, args.seed)
+    with tempfile.TemporaryDirectory(prefix="psd_bench_fetch_") as work_dir, \
+            StringStandIn(network, faults_from_args(args)) as stand_in:
+        os.environ.update(PSD_STRING_API_URL=stand_in.url, PSD_CACHE=str(Path(work_dir) / "cache.sqlite"),
+                          PSD_RATE_LIMIT=str(args.rate_limit), PSD_HTTP_RETRIES=str(args.retries))
+        os.environ.pop("PSD_STRING_DUMP", None)
+        if args.workers:
+            os.environ["PSD_FETCH_WORKERS"] = str(args.workers)
+        if args.chunk_size:
+            os.environ["PSD_FETCH_CHUNK_SIZE"] = str(args.chunk_size)
+        phases = run_benchmark(stand_in, proteins, work_dir)
+
+    for phase in phases:
+        server = phase["server"]
+        print(f"[INFO] {phase['phase']:<14} {phase['wall_s']:8.3f}s  {server['requests']:5d} requests  "
+              f"{server['bytes_sent']:>10d} bytes  status {server['status']}"
+              + (f"  [ERROR] {phase['error']}" if "error" in phase else ""))
+
+    if args.output:
+        result = {
+            "benchmark": "fetch",
+            "proteins": len(proteins),
+            "settings": {key: value for key, value in vars(args).items() if key != "output"},
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "phases": phases,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(f"[INFO] Wrote fetch benchmark to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
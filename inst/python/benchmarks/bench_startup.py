@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from a fresh interpreter to the first built layer.
+
+Every repeat starts a new Python process that imports Network_builder and
+builds the scaffold layer of the input file (plus --layers expansion layers,
+answered from $PSD_CACHE or $PSD_STRING_DUMP), and records which heavy
+modules were loaded by then. The timings are written as JSON.
+
+With --baseline the run is checked against an earlier result: it fails when
+the median cold start is more than --tolerance slower, and always fails when
+a rendering or HTTP module (HEAVY_MODULES) was imported before the first
+layer was built.
+
+    python benchmarks/bench_startup.py --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_INPUT = PYTHON_DIR / "scaffolds.tsv"
+
+# modules the layers never need: pyvis (and the IPython it pulls in) renders, requests fetches
+HEAVY_MODULES = ("pyvis", "IPython", "requests")
+
+PROBE = """
+import json, os, shutil, sys, tempfile, time
+start = time.perf_counter()
+sys.path.insert(0, {python_dir!r})
+import Network_builder
+imported = time.perf_counter()
+
+work = tempfile.mkdtemp()
+shutil.copy({input_path!r}, work)
+build = Network_builder.NetworkBuild(os.path.basename({input_path!r}), "main.html", work,
+                                     renderer="stream", checkpoints=False)
+stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+build.build_scaffold_layer()
+for i in range(1, {layers} + 1):
+    build.expand_one_more_layer(i, Network_builder.LAYER_SIZE, {threshold})
+sys.stdout = stdout
+built = time.perf_counter()
+shutil.rmtree(work, ignore_errors=True)
+print(json.dumps({{"import_s": imported - start, "first_layer_s": built - imported,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_probe(input_path, layers, threshold):
+    """One cold start in a new interpreter; returns its measurements."""
+    code = PROBE.format(python_dir=str(PYTHON_DIR), input_path=str(input_path), layers=layers,
+                        threshold=threshold, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=tempfile.gettempdir())
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"[ERROR] Startup probe failed:\n{result.stderr}")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe["cold_start_s"] = wall
+    return probe
+
+
+def run_benchmark(input_path=DEFAULT_INPUT, repeats=5, layers=0, threshold=2):
+    runs = [run_probe(input_path, layers, threshold) for _ in range(repeats)]
+    summary = {key: {"median": statistics.median(run[key] for run in runs),
+                     "min": min(run[key] for run in runs)}
+               for key in ("cold_start_s", "import_s", "first_layer_s")}
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    return {
+        "benchmark": "startup",
+        "input": str(input_path),
+        "layers": layers,
+        "repeats": repeats,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "summary": summary,
+        "heavy_modules_loaded": loaded,
+        "runs": runs,
+    }
+
+
+def check_against(result, baseline, tolerance):
+    """Regression messages for result compared with baseline (empty when it passes)."""
+    problems = []
+    if result["heavy_modules_loaded"]:
+        problems.append(f"heavy modules imported before the first layer: {result['heavy_modules_loaded']}")
+    if baseline is not None:
+        before = baseline["summary"]["cold_start_s"]["median"]
+        now = result["summary"]["cold_start_s"]["median"]
+        if now > before * (1 + tolerance):
+            problems.append(f"median cold start {now:.3f}s is more than {tolerance:.0%} slower "
+                            f"than the baseline's {before:.3f}s")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a cold start from the interpreter to the first layer.")
+    parser.add_argument("--input", default=str(DEFAULT_INPUT), help="seed TSV (default: the bundled scaffolds.tsv)")
+    parser.add_argument("--repeats", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--layers", type=int, default=0,
+                        help="expansion layers after the scaffolds (need $PSD_CACHE or $PSD_STRING_DUMP to stay offline)")
+    parser.add_argument("--threshold", type=int, default=2, help="minimum interactions for the expansion layers")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="earlier JSON result to guard against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    result = run_benchmark(Path(args.input).resolve(), args.repeats, args.layers, args.threshold)
+    summary = result["summary"]
+    print(f"[INFO] cold start {summary['cold_start_s']['median']:.3f}s "
+          f"(import {summary['import_s']['median']:.3f}s, first layer {summary['first_layer_s']['median']:.3f}s; "
+          f"median of {args.repeats})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(f"[INFO] Wrote startup benchmark to: {args.output}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    problems = check_against(result, baseline, args.tolerance)
+    for problem in problems:
+        print(f"[ERROR] {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the layer pipeline.
+
+Every case runs on the bundled fixtures (scaffolds.tsv, scaffolds#.tsv and
+the up_to_layer*.tsv files) and on seeded scale-free networks from
+generate_network.py (1k to 100k edges by default, --sizes up to 1M):
+
+  parse_csv           InteractionProcessor.process_interactions (csv reader)
+  parse_table         load_processor: InteractionTable + InteractionProcessor.from_table
+  select_selective    NetworkBuild.create_nested_list_of_layers_selective
+  select_nested_list  NestedList.create_nested_list_of_layers_selective1
+  extend_graph        NetworkBuild.extend_graph_selective (parse, three layers, nodes and edges)
+  render_pyvis        extend_graph + writing the pyvis HTML
+  render_stream       extend_graph + writing the streamed page and data file
+
+Selection and extension start from a seed layer holding the first
+SEED_FRACTION of the file's proteins, as the scaffolds would. Wall and CPU
+time (median and min of --repeats), the input size and what each case
+produced are written as JSON, together with a log-log scaling exponent per
+case over the generated networks, so results of two releases can be put
+side by side with --compare.
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --sizes 1000,1000000 --compare results.json
+"""
+import argparse
+import gc
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PYTHON_DIR))
+
+import numpy as np  # noqa: E402
+
+from File_processor import InteractionProcessor  # noqa: E402
+from Layer_index import KINDS, SELECTIVE  # noqa: E402
+from Nested_list_of_layers import NestedList  # noqa: E402
+from Network_builder import NetworkBuild, LAYER_SIZE  # noqa: E402
+from Network_cache import network_cache, load_processor, load_table  # noqa: E402
+from generate_network import generate_network  # noqa: E402
+
+REPO_DIR = PYTHON_DIR.parent.parent
+DEFAULT_SIZES = (1000, 10000, 100000)
+SEED_FRACTION = 0.02  # share of a file's proteins used as the seed layer (at least MIN_SEEDS)
+MIN_SEEDS = 5
+SLOWER = 1.25         # --compare flags cases that got this much slower
+
+
+def fixture_files():
+    """The interaction files shipped with the repository."""
+    candidates = [REPO_DIR / "scaffolds.tsv", REPO_DIR / "scaffolds#.tsv", REPO_DIR / "up_to_layer2_cumulative.tsv"]
+    candidates += sorted((REPO_DIR / "tests" / "testthat").glob("up_to_layer*.tsv"))
+    found = [path for path in candidates if path.exists()]
+    return found or [PYTHON_DIR / "scaffolds.tsv"]
+
+
+def generated_files(sizes, data_dir, seed):
+    """Scale-free networks of every size in data_dir, generated once per size and seed."""
+    files = []
+    for size in sizes:
+        path = Path(data_dir) / f"scale_free_{size}_seed{seed}.tsv"
+        if not path.exists():
+            print(f"[INFO] Generating a {size}-edge scale-free network...")
+            generate_network(path, size, seed)
+        files.append(path)
+    return files
+
+
+def input_label(path):
+    """How an input is named in the results: its path in the repository, or its file name."""
+    try:
+        return Path(path).resolve().relative_to(REPO_DIR).as_posix()
+    except ValueError:
+        return Path(path).name
+
+
+def count_rows(path):
+    with open(path, "rb") as file:
+        return max(0, sum(1 for _ in file) - 1)
+
+
+# =========================================================
+# === CASES ================================================
+# =========================================================
+# Each case returns (setup, run): setup() prepares untimed state for one
+# repeat and run(state) does the timed work, returning what it produced.
+
+def seed_names(path):
+    names = load_table(path).names
+    return names[:max(MIN_SEEDS, int(len(names) * SEED_FRACTION))]
+
+
+def seeded_build(path, work_dir, renderer="pyvis"):
+    """A NetworkBuild whose layer 0 (of every kind) is the seed proteins of path."""
+    seeds = seed_names(path)
+    build = NetworkBuild(str(path), Path(work_dir) / "bench.html", work_dir, renderer=renderer,
+                         checkpoints=False, export="off")
+    for kind in KINDS:
+        build.layer_index.add_layer(kind, seeds)
+    return build
+
+
+def fresh_cache(path):
+    """Empty the parsed-file cache, then parse path again unless only the parse is timed."""
+    network_cache.clear()
+    load_processor(path)
+
+
+def case_parse_csv(path, work_dir, threshold):
+    def run(_):
+        processor = InteractionProcessor(str(path))
+        processor.process_interactions()
+        return {"proteins": len(processor.protein_name_list)}
+    return (lambda: None), run
+
+
+def case_parse_table(path, work_dir, threshold):
+    def run(_):
+        processor = load_processor(path)
+        return {"proteins": len(processor.protein_name_list)}
+    return network_cache.clear, run
+
+
+def case_select_selective(path, work_dir, threshold):
+    def setup():
+        fresh_cache(path)
+        build = seeded_build(path, work_dir)
+        build.create_nested_list_of_layers(path)
+        return build
+
+    def run(build):
+        build.create_nested_list_of_layers_selective(path, threshold)
+        return {"selected": len(build.layer_index.layers(SELECTIVE)[-1])}
+    return setup, run
+
+
+def case_select_nested_list(path, work_dir, threshold):
+    def setup():
+        fresh_cache(path)
+        return NestedList([list(seed_names(path))])
+
+    def run(nested_list):
+        nested_list.create_nested_list_of_layers_selective1(path, threshold)
+        return {"selected": len(nested_list.nested_list[-1])}
+    return setup, run
+
+
+def extend_case(renderer, render):
+    def case(path, work_dir, threshold):
+        def setup():
+            if render:
+                import pyvis.network  # noqa: F401  (the first import is not part of rendering)
+            fresh_cache(path)
+            build = seeded_build(path, work_dir, renderer)
+            network_cache.clear()
+            return build
+
+        def run(build):
+            build.extend_graph_selective(str(path), LAYER_SIZE, threshold)
+            produced = {"nodes": len(build.edge_builder.nodes), "edges": len(build.edge_builder.edges)}
+            if render:
+                build.render()
+                produced["output_mb"] = round(sum(f.stat().st_size for f in Path(work_dir).glob("bench*")) / 2 ** 20, 3)
+            return produced
+        return setup, run
+    return case
+
+
+CASES = {
+    "parse_csv": case_parse_csv,
+    "parse_table": case_parse_table,
+    "select_selective": case_select_selective,
+    "select_nested_list": case_select_nested_list,
+    "extend_graph": extend_case("pyvis", render=False),
+    "render_pyvis": extend_case("pyvis", render=True),
+    "render_stream": extend_case("stream", render=True),
+}
+
+
+# =========================================================
+# === RUNNER ===============================================
+# =========================================================
+def measure(setup, run, repeats, memory=False):
+    walls, cpus = [], []
+    produced = {}
+    for _ in range(repeats):
+        state = setup()
+        gc.collect()
+        wall, cpu = time.perf_counter(), time.process_time()
+        produced = run(state) or {}
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+
+    result = {"wall_s": {"median": statistics.median(walls), "min": min(walls)},
+              "cpu_s": {"median": statistics.median(cpus), "min": min(cpus)},
+              **produced}
+    if memory:
+        state = setup()
+        gc.collect()
+        tracemalloc.start()
+        run(state)
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    return result
+
+
+def scaling_exponents(results, generated):
+    """Slope of log(median wall time) over log(edges) per case, on the generated networks."""
+    exponents = {}
+    for case in {result["case"] for result in results}:
+        points = [(result["rows"], result["wall_s"]["median"]) for result in results
+                  if result["case"] == case and result["input"] in generated
+                  and "wall_s" in result and result["wall_s"]["median"] > 0]
+        if len(points) >= 2:
+            x, y = zip(*points)
+            exponents[case] = round(float(np.polyfit(np.log(x), np.log(y), 1)[0]), 3)
+    return exponents
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases, inputs, generated=(), repeats=3, threshold=1, memory=False):
+    results = []
+    for path in inputs:
+        rows = count_rows(path)
+        for name in cases:
+            work_dir = tempfile.mkdtemp(prefix="psd_bench_")
+            label = input_label(path)
+            result = {"case": name, "input": label, "rows": rows}
+            try:
+                setup, run = CASES[name](path, work_dir, threshold)
+                result.update(measure(setup, run, repeats, memory))
+            except Exception as e:
+                # a case that cannot read an input is reported, not fatal
+                result["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            if "error" in result:
+                print(f"[WARN] {name:<19} {label:<40} failed: {result['error']}")
+            else:
+                print(f"[INFO] {name:<19} {label:<40} {rows:>8} rows  "
+                      f"{result['wall_s']['median'] * 1000:10.1f} ms")
+            results.append(result)
+
+    return {
+        "suite": "pipeline",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "threshold": threshold,
+        "results": results,
+        "scaling_exponent": scaling_exponents(results, {input_label(path) for path in generated}),
+    }
+
+
+def compare(report, baseline):
+    """Print the median wall time of every case against an earlier report."""
+    before = {(r["case"], r["input"]): r["wall_s"]["median"] for r in baseline["results"] if "wall_s" in r}
+    print(f"[INFO] Compared with {baseline.get('git_commit') or 'baseline'} ({baseline.get('created')}):")
+    for result in report["results"]:
+        old = before.get((result["case"], result["input"]))
+        if not old or "wall_s" not in result:
+            continue
+        ratio = result["wall_s"]["median"] / old
+        flag = "  <-- slower" if ratio > SLOWER else ""
+        print(f"  {result['case']:<19} {result['input']:<40} {old * 1000:10.1f} -> "
+              f"{result['wall_s']['median'] * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks of parsing, layer selection, graph extension and rendering.")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases (default: all)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="edges of the generated networks, e.g. 1000,1000000 (empty: fixtures only)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated networks")
+    parser.add_argument("--data-dir", help="keep the generated networks here for later runs (default: a temporary directory)")
+    parser.add_argument("--no-fixtures", action="store_true", help="only run the generated networks")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threshold", type=int, default=1, help="minimum interactions used by the selection cases")
+    parser.add_argument("--memory", action="store_true", help="also record the tracemalloc peak of every case")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--compare", help="earlier results JSON to compare with")
+    args = parser.parse_args()
+
+    cases = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases {unknown}; choose from {list(CASES)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="psd_bench_data_")
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    try:
+        generated = generated_files(sizes, data_dir, args.seed)
+        inputs = ([] if args.no_fixtures else fixture_files()) + generated
+        report = run_suite(cases, inputs, generated, args.repeats, args.threshold, args.memory)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"[INFO] Scaling exponents (time ~ edges^k): {report['scaling_exponent']}")
+    print(f"[INFO] Wrote benchmark results to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Seeded generator of scale-free interaction networks in the 13-column
+STRING format the pipeline reads (the same layout as up_to_layer*.tsv:
+two names, two STRING ids, eight channel scores left at 0 and the
+combined score).
+
+    python benchmarks/generate_network.py 100000 net_100k.tsv --seed 1
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from get_files1 import HEADER  # noqa: E402
+
+EDGES_PER_NODE = 4          # edges every new protein attaches with (Barabási–Albert m)
+HIGH_SCORE_FRACTION = 0.6   # share of edges above the 0.95 combined_score cut
+
+
+def scale_free_edges(n_edges, seed=0, edges_per_node=EDGES_PER_NODE):
+    """
+    n_edges distinct undirected (i, j) pairs grown by preferential
+    attachment: every new node links to edges_per_node earlier nodes picked
+    with probability proportional to their degree, so the degrees follow a
+    power law with a few large hubs, as in STRING.
+    """
+    rng = random.Random(seed)
+    m = edges_per_node
+    edges = [(i, j) for i in range(m + 1) for j in range(i)][:n_edges]
+
+    # every edge endpoint once: a uniform pick from it is a degree-weighted pick
+    endpoints = [node for edge in edges for node in edge]
+    node = m + 1
+    while len(edges) < n_edges:
+        targets = set()
+        while len(targets) < min(m, node, n_edges - len(edges)):
+            targets.add(endpoints[rng.randrange(len(endpoints))])
+        for target in targets:
+            edges.append((node, target))
+            endpoints.extend((node, target))
+        node += 1
+    return edges
+
+
+def generate_network(path, n_edges, seed=0, edges_per_node=EDGES_PER_NODE,
+                     high_score_fraction=HIGH_SCORE_FRACTION):
+    """
+    Write a scale-free network with n_edges interactions to path; the same
+    seed always gives the same file. Returns {"edges", "nodes", "high_score_edges"}.
+    """
+    rng = random.Random(seed + 1)
+    edges = scale_free_edges(n_edges, seed, edges_per_node)
+    high = 0
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as file:
+        file.write(HEADER)
+        for i, j in edges:
+            # integer thousandths, so no score lands on the 0.95 cut by rounding
+            if rng.random() < high_score_fraction:
+                score = rng.randint(951, 999)
+                high += 1
+            else:
+                score = rng.randint(150, 950)
+            file.write(f"G{i:07d}\tG{j:07d}\tSYN.{i:07d}\tSYN.{j:07d}\t0\t0\t0\t0\t0\t0\t0\t0\t{score / 1000:.3f}\n")
+    nodes = 1 + max(max(edge) for edge in edges) if edges else 0
+    return {"edges": len(edges), "nodes": nodes, "high_score_edges": high}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a seeded scale-free network in STRING TSV format.")
+    parser.add_argument("edges", type=int, help="number of interactions")
+    parser.add_argument("output", help="TSV file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--edges-per-node", type=int, default=EDGES_PER_NODE)
+    parser.add_argument("--high-score-fraction", type=float, default=HIGH_SCORE_FRACTION,
+                        help="share of interactions with combined_score > 0.95")
+    args = parser.parse_args()
+
+    stats = generate_network(args.output, args.edges, args.seed, args.edges_per_node, args.high_score_fraction)
+    print(f"[INFO] Wrote {stats['edges']} interactions between {stats['nodes']} proteins "
+          f"({stats['high_score_edges']} above 0.95) to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
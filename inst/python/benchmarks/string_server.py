@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the STRING web API.
+
+Serves the interaction_partners and network methods in tsv-no-header
+format from a synthetic network (generate_network.py), any 13-column
+interaction TSV, or an offline index of a STRING dump (String_offline),
+so the fetchers can be load-tested without the public service. Point them
+at it with
+
+    python benchmarks/string_server.py --synthetic 100000 --latency 0.2 --p5xx 0.05
+    PSD_STRING_API_URL=http://127.0.0.1:8765/api python main.py
+
+Faults are drawn per request from a seeded generator: a fixed latency plus
+jitter, a requests-per-second cap and a byte-rate cap, random 429 and 5xx
+answers, and truncated bodies ("cut": a shorter body that is complete as
+far as HTTP is concerned, "drop": the connection closes before the
+announced Content-Length). GET /stats returns the request counters as JSON.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from generate_network import generate_network  # noqa: E402
+
+DEFAULT_PORT = 8765
+DEFAULT_REQUIRED_SCORE = 400  # STRING's default "medium confidence"
+TAXON = 9606
+ERROR_STATUSES = (500, 502, 503, 504)
+WRITE_CHUNK = 1 << 16
+METHOD_PATH = re.compile(r"/(?:tsv-no-header|tsv)/(interaction_partners|network)/?$")
+IDENTIFIER_SEPARATORS = re.compile(r"%0d|\r|\n", re.IGNORECASE)
+
+
+class TsvNetwork:
+    """
+    STRING API answers from a 13-column interaction TSV (a layer file or a
+    generate_network output): partners are listed by descending combined
+    score, rows use the API's column order (stringId_A, stringId_B,
+    preferredName_A, preferredName_B, ncbiTaxonId, score and the seven
+    channel scores, left at 0).
+    """
+
+    def __init__(self, path, taxon=TAXON):
+        self.taxon = taxon
+        self.string_id = {}
+        partners = {}
+        with open(path, encoding="utf-8") as file:
+            next(file, None)
+            for line in file:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) < 13:
+                    continue
+                a, b, score = parts[0], parts[1], round(float(parts[12]) * 1000)
+                for name, string_id in ((a, parts[2]), (b, parts[3])):
+                    if name not in self.string_id:
+                        self.string_id[name] = string_id if string_id not in ("", "0") else f"{taxon}.{name}"
+                partners.setdefault(a, {})[b] = score
+                partners.setdefault(b, {})[a] = score
+
+        # name -> [(score, partner)] strongest first
+        self.partners = {name: sorted(((score, partner) for partner, score in found.items()),
+                                      key=lambda item: -item[0])
+                         for name, found in partners.items()}
+        self.names = list(self.string_id)
+        self.lookup = {name: name for name in self.names}
+        self.lookup.update((string_id, name) for name, string_id in self.string_id.items())
+
+    def resolve(self, identifiers):
+        return list(dict.fromkeys(self.lookup[i] for i in identifiers if i in self.lookup))
+
+    def _row(self, a, b, score):
+        return "\t".join([self.string_id[a], self.string_id[b], a, b, str(self.taxon),
+                          format(score / 1000, "g")] + ["0"] * 7)
+
+    def interaction_partners(self, identifiers, limit=None, required_score=DEFAULT_REQUIRED_SCORE):
+        rows = []
+        for a in self.resolve(identifiers):
+            strong = [(score, b) for score, b in self.partners.get(a, ()) if score >= required_score]
+            rows.extend(self._row(a, b, score) for score, b in strong[:limit])
+        return "\n".join(rows) + "\n" if rows else ""
+
+    def network(self, identifiers, required_score=DEFAULT_REQUIRED_SCORE):
+        members = self.resolve(identifiers)
+        wanted = set(members)
+        rows, seen = [], set()
+        for a in members:
+            for score, b in self.partners.get(a, ()):
+                if b in wanted and score >= required_score and (b, a) not in seen:
+                    seen.add((a, b))
+                    rows.append(self._row(a, b, score))
+        return "\n".join(rows) + "\n" if rows else ""
+
+    def query(self, method, identifiers, limit=None, required_score=DEFAULT_REQUIRED_SCORE):
+        if method == "interaction_partners":
+            return self.interaction_partners(identifiers, limit, int(required_score))
+        return self.network(identifiers, int(required_score))
+
+
+class Faults:
+    """What goes wrong, and how slowly, for each request."""
+
+    def __init__(self, latency=0.0, jitter=0.0, max_rps=None, bandwidth=None, p429=0.0, p5xx=0.0,
+                 truncate=0.0, truncate_mode="cut", seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rps = max_rps
+        self.bandwidth = bandwidth  # bytes per second and response, None = unlimited
+        self.p429 = p429
+        self.p5xx = p5xx
+        self.truncate = truncate
+        self.truncate_mode = truncate_mode
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = []  # start times of the requests of the last second
+
+    def draw(self):
+        """(status or None, delay, truncate) for the next request; None means answer normally."""
+        with self._lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if self.max_rps is not None and len(self._window) >= self.max_rps:
+                return 429, 0.0, False
+            self._window.append(now)
+
+            roll = self._rng.random()
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            if roll < self.p429:
+                return 429, delay, False
+            if roll < self.p429 + self.p5xx:
+                return self._rng.choice(ERROR_STATUSES), delay, False
+            return None, delay, self._rng.random() < self.truncate
+
+
+class StringStandIn:
+    """
+    The HTTP server around a network (TsvNetwork or String_offline.OfflineString)
+    and Faults; start() serves from a background thread and url is the base
+    URL to put in $PSD_STRING_API_URL.
+    """
+
+    def __init__(self, network, faults=None, host="127.0.0.1", port=0, verbose=False):
+        self.network = network
+        self.faults = faults or Faults()
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"requests": 0, "identifiers": 0, "bytes_sent": 0, "truncated": 0,
+                           "status": {}, "method": {}}
+
+    def stats(self):
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _count(self, method=None, status=None, identifiers=0, sent=0, truncated=False):
+        with self._lock:
+            stats = self._stats
+            stats["requests"] += 1
+            stats["identifiers"] += identifiers
+            stats["bytes_sent"] += sent
+            stats["truncated"] += int(truncated)
+            if method:
+                stats["method"][method] = stats["method"].get(method, 0) + 1
+            stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                if stand_in.verbose:
+                    super().log_message(format, *args)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path.rstrip("/").endswith("/stats"):
+                    return self._send(200, json.dumps(stand_in.stats()).encode(), "application/json")
+                self._answer(url.path, parse_qs(url.query, keep_blank_values=True))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8")
+                self._answer(urlsplit(self.path).path, parse_qs(body, keep_blank_values=True))
+
+            def _send(self, status, body, content_type="text/plain; charset=utf-8", headers=(), announced=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body) if announced is None else announced))
+                for name, value in headers:
+                    self.send_header(name, value)
+                if announced is not None:
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+
+                bandwidth = stand_in.faults.bandwidth
+                for start in range(0, len(body), WRITE_CHUNK):
+                    chunk = body[start:start + WRITE_CHUNK]
+                    self.wfile.write(chunk)
+                    if bandwidth:
+                        time.sleep(len(chunk) / bandwidth)
+
+            def _answer(self, path, form):
+                match = METHOD_PATH.search(path)
+                if match is None:
+                    stand_in._count(status=404)
+                    self._send(404, b"unknown method\n")
+                    return
+                method = match.group(1)
+                identifiers = [i for value in form.get("identifiers", [])
+                               for i in IDENTIFIER_SEPARATORS.split(value) if i]
+
+                status, delay, truncate = stand_in.faults.draw()
+                time.sleep(delay)
+                if status is not None:
+                    stand_in._count(method, status, len(identifiers))
+                    self._send(status, f"simulated {status}\n".encode(), headers=[("Retry-After", "1")])
+                    return
+
+                limit = form.get("limit", [None])[0]
+                required_score = form.get("required_score", [DEFAULT_REQUIRED_SCORE])[0]
+                body = stand_in.network.query(method, identifiers, int(limit) if limit else None,
+                                              int(required_score)).encode("utf-8")
+                announced = None
+                if truncate and body:
+                    if stand_in.faults.truncate_mode == "drop":
+                        announced = len(body)
+                    body = body[:len(body) // 2]
+                # counted before sending, so a client never sees an answer the stats do not hold yet
+                stand_in._count(method, 200, len(identifiers), len(body), truncate and len(body) > 0)
+                self._send(200, body, announced=announced)
+
+        return Handler
+
+
+def load_network(index=None, tsv=None, synthetic=None, seed=0):
+    """The network to serve: an offline STRING index, a TSV file or a generated one with synthetic edges."""
+    if index:
+        from String_offline import OfflineString
+
+        return OfflineString(index)
+    if synthetic:
+        path = Path(tempfile.mkdtemp(prefix="psd_stand_in_")) / f"scale_free_{synthetic}.tsv"
+        generate_network(path, synthetic, seed)
+        tsv = path
+    if not tsv:
+        raise ValueError("[ERROR] Give --index, --tsv or --synthetic")
+    return TsvNetwork(tsv)
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds more, uniformly")
+    parser.add_argument("--max-rps", type=float, default=None, help="answer 429 above this many requests per second")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes per second each response is sent at")
+    parser.add_argument("--p429", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--p5xx", type=float, default=0.0, help="share of requests answered 500/502/503/504")
+    parser.add_argument("--truncate", type=float, default=0.0, help="share of answers cut in half")
+    parser.add_argument("--truncate-mode", choices=("cut", "drop"), default="cut",
+                        help="cut: a shorter but complete body; drop: close before the announced length")
+    parser.add_argument("--fault-seed", type=int, default=0, help="seed of the fault draws")
+
+
+def faults_from_args(args):
+    return Faults(args.latency, args.jitter, args.max_rps, args.bandwidth, args.p429, args.p5xx,
+                  args.truncate, args.truncate_mode, args.fault_seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the STRING API.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index", help="offline STRING index directory (String_offline)")
+    source.add_argument("--tsv", help="13-column interaction TSV to serve")
+    source.add_argument("--synthetic", type=int, help="serve a generated scale-free network with this many edges")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated network")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    network = load_network(args.index, args.tsv, args.synthetic, args.seed)
+    stand_in = StringStandIn(network, faults_from_args(args), args.host, args.port, args.verbose)
+    print(f"[INFO] STRING stand-in serving {len(network.names)} proteins "
+          f"at {stand_in.url}; set PSD_STRING_API_URL={stand_in.url} to use it")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+        print(f"[INFO] {json.dumps(stand_in.stats())}")
+
+
+if __name__ == "__main__":
+    main()
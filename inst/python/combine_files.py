@@ -7,6 +7,8 @@ def add_proteins_to_layer(input_file, layer_file):
 
 import os
 
+from Network_cache import invalidate
+
 
 def search_files(directory, new_file_path):
     with open(new_file_path, 'w') as new_file:
@@ -28,13 +30,15 @@ def search_files(directory, new_file_path):
 
                     # Write the content to the new file
                     new_file.writelines(content)
+    invalidate(new_file_path)
 
 
 # Example usage
-search_files('C:\\Users\\User\PycharmProjects\pythonProject5\scaffolds_layer_Proteins_and_their_interactions',
-             'scaffolds#.tsv')  # Searching for .txt files
-search_files('C:\\Users\\User\PycharmProjects\pythonProject5\\2nd_layer_Proteins_and_their_interactions',
-             '2nd_layer#.tsv')  # Searching for .txt files
+if __name__ == "__main__":
+    search_files('C:\\Users\\User\PycharmProjects\pythonProject5\scaffolds_layer_Proteins_and_their_interactions',
+                 'scaffolds#.tsv')  # Searching for .txt files
+    search_files('C:\\Users\\User\PycharmProjects\pythonProject5\\2nd_layer_Proteins_and_their_interactions',
+                 '2nd_layer#.tsv')  # Searching for .txt files
 '''
 search_files('C:\\Users\\User\PycharmProjects\pythonProject5\\3rd_layer_Proteins_and_their_interactions',
              '3rd_layer#.tsv')
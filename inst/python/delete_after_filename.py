@@ -27,7 +27,8 @@ def delete_after_name(file_list):
         print(f"An error occurred: {e}")
 
 
-delete_after_name(files_to_move_to3layer)
-delete_after_name(files_to_move_to4layer)
-delete_after_name(files_to_move_to5layer)
-delete_after_name(files_to_move_to6layer)
\ No newline at end of file
+if __name__ == "__main__":
+    delete_after_name(files_to_move_to3layer)
+    delete_after_name(files_to_move_to4layer)
+    delete_after_name(files_to_move_to5layer)
+    delete_after_name(files_to_move_to6layer)
@@ -1,18 +1,22 @@
 import argparse
 
 
-from stringdb import STRINGdb
+import String_api
+
+# column names of a STRING tsv response
+API_COLUMNS = ["stringId_A", "stringId_B", "preferredName_A", "preferredName_B", "ncbiTaxonId",
+               "score", "nscore", "fscore", "pscore", "ascore", "escore", "dscore", "tscore"]
 
 
 def get_protein_interactions(version, species, score_threshold, protein_list, limit):
-    string_db = STRINGdb(version=version, species=species, score_threshold=score_threshold)
-    #string_db = STRINGdb()
-    # protein_list = ["GNAQ"]
+    # one interaction_partners call per protein through the shared STRING
+    # client (pooled session, retries, rate limiting, response cache)
     for protein_name in protein_list:
-        protein_id = string_db.get_string_id([protein_name])
-        protein_interactions = string_db.get_interactions(protein_id, limit=limit)
+        protein_interactions = String_api.query("interaction_partners", [protein_name], species=species,
+                                                limit=limit, version=version, required_score=score_threshold)
         with open(f"{protein_name}.tsv", "w") as f:
-            f.write(protein_interactions.to_csv(sep="\t", index=False))
+            f.write("\t".join(API_COLUMNS) + "\n")
+            f.write(protein_interactions)
 
 
 '''string_db = STRINGdb(version="11.5", species=9606, score_threshold=200, network_type="full", input_directory="")
@@ -24,7 +28,7 @@ for protein in protein_list:
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Retrieve protein interactions from STRINGdb and save to a file.")
+    parser = argparse.ArgumentParser(description="Retrieve protein interactions from STRING and save to a file.")
     parser.add_argument("--version", type=str, default="12.0", help="STRINGdb version")
     parser.add_argument("--species", type=int, default=9606, help="Species ID")
     parser.add_argument("--score_threshold", type=int, default=400, help="Score threshold")
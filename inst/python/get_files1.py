@@ -11,9 +11,14 @@ import os
 ################################################################
 
 
-import requests  ## python -m
+from concurrent.futures import ThreadPoolExecutor
 
-import delete_after_filename
+import String_api
+from Network_cache import invalidate
+
+# identifiers per interaction_partners request, and requests in flight at once
+CHUNK_SIZE = 50
+MAX_WORKERS = 4
 
 
 def is_file_empty(file_name):
@@ -31,76 +36,106 @@ def delete(file_name):
         os.remove(file_name)
 
 
+HEADER = ("#node1\tnode2\tnode1_string_id\tnode2_string_id\tneighborhood_on_chromosome\tgene_fusion\t"
+          "phylogenetic_cooccurrence\thomology\tcoexpression\t"
+          "experimentally_determined_interaction\tdatabase_annotated\tautomated_textmining\t"
+          "combined_score\n")
+
+
 def create_file_if_not_exists(file_name):
     """ Create a file with a header if it does not exist """
     if not os.path.exists(file_name):
         with open(file_name, 'w') as file:
-            file.write("#node1\tnode2\tnode1_string_id\tnode2_string_id\tneighborhood_on_chromosome\tgene_fusion\t"
-                       "phylogenetic_cooccurrence\thomology\tcoexpression\t"
-                       "experimentally_determined_interaction\tdatabase_annotated\tautomated_textmining\t"
-                       "combined_score\n")
-
-
+            file.write(HEADER)
+
+
+def write_rows(file_name, rows, append=True):
+    """
+    Append rows (lists of fields) to file_name through one buffered handle,
+    adding the header to a new file; append=False starts the file afresh
+    """
+    new_file = not append or not os.path.exists(file_name)
+    with open(file_name, 'a' if append else 'w', encoding='utf-8', buffering=1 << 16) as file:
+        if new_file:
+            file.write(HEADER)
+        file.write("".join("\t".join(row) + "\n" for row in rows))
+    invalidate(file_name)
+
+
+def interaction_row(query_name, partner_name, combined_score):
+    """ 13-column row in the layer file format: 2 names, 10 zeros, score """
+    return [query_name, partner_name] + ["0"] * 10 + [combined_score]
+
+
+def fetch_partners(my_genes, chunk_size=None, max_workers=None):
+    """
+    interaction_partners response text for my_genes.
+
+    The list is split into chunks of chunk_size identifiers (default
+    $PSD_FETCH_CHUNK_SIZE or CHUNK_SIZE) that are fetched by at most
+    max_workers threads ($PSD_FETCH_WORKERS or MAX_WORKERS). Partners are
+    listed per query protein, so joining the chunk responses in chunk order
+    gives the same rows as one request for the whole list. Partners are
+    cached per protein (String_api.query_partners), so proteins fetched
+    before, by this run or another, are not requested again.
+    """
+    chunk_size = chunk_size or int(os.getenv("PSD_FETCH_CHUNK_SIZE", CHUNK_SIZE))
+    max_workers = max_workers or int(os.getenv("PSD_FETCH_WORKERS", MAX_WORKERS))
+    my_genes = list(my_genes)
+    chunks = [my_genes[i:i + chunk_size] for i in range(0, len(my_genes), chunk_size)]
+
+    def fetch(chunk):
+        return String_api.query_partners(chunk, limit=10)
+
+    if len(chunks) <= 1:
+        return fetch(my_genes)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        texts = list(pool.map(fetch, chunks))
+    return "".join(text if text.endswith("\n") else text + "\n" for text in texts if text)
+
+
+def iter_partner_records(my_genes):
+    """ Yield (query_name, partner_name, combined_score) for every partner row STRING returns for my_genes """
+    response_text = fetch_partners(my_genes)
+    for line in response_text.strip().split("\n"):
 
+        l = line.strip().split("\t")
+        if len(l) >= 6:
+            yield l[2], l[3], l[5]
+        elif line.strip():
+            print(l)
 
-def get_files_from_list(my_genes):
-    #version-11-5.
-    string_api_url = "https://string-db.org/api"
-    # string_api_url = "https://version-12.string-db.org/api"
-    output_format = "tsv-no-header"
-    method = "interaction_partners"
-
-    request_url = "/".join([string_api_url, output_format, method])
-    ##
-    ## Set parameters
-    ##
-
-    params = {
 
-        "identifiers": "%0d".join(my_genes),  # your protein
-        "species": 9606,  # species NCBI identifier
-        "limit": 10,
-        "caller_identity": "www.awesome_app.org"  # your app name
+def write_partner_files(records, directory=".", combined_file=None):
+    """
+    Pass records through unchanged while collecting them, then write one
+    <PROTEIN>.tsv per query protein into directory (and every row into
+    combined_file, if given) once the records are exhausted.
+    """
+    rows_per_protein = {}
+    for record in records:
+        rows_per_protein.setdefault(record[0], []).append(interaction_row(*record))
+        yield record
 
-    }
+    # every file is written afresh, so files left by an earlier build are never appended to
+    for query_name, rows in rows_per_protein.items():
+        write_rows(os.path.join(directory, f"{query_name}.tsv"), rows, append=False)
+    if combined_file is not None:
+        write_rows(combined_file, [row for rows in rows_per_protein.values() for row in rows], append=False)
 
-    ##
-    ## Call STRING
-    ##
+    print(f"[INFO] Wrote {sum(len(rows) for rows in rows_per_protein.values())} partner rows "
+          f"for {len(rows_per_protein)} proteins")
 
-    response = requests.post(request_url, data=params)
 
+def get_files_from_list(my_genes, directory="."):
     ##
-    ## Read and parse the results
+    ## Call STRING for the 10 best partners of every protein
+    ## (chunked, concurrent and read through the local response cache)
+    ## and write every <PROTEIN>.tsv into directory in one pass
     ##
 
-    for line in response.text.strip().split("\n"):
-
-        l = line.strip().split("\t")
-        if len(l) >= 6:
-            query_ensp = l[0]
-            query_name = l[2]
-            partner_ensp = l[1]
-            partner_name = l[3]
-            combined_score = l[5]
-            file_path = f"{query_name}.tsv"
-            #delete(file_path)
-
-            # Create the file if it does not exist
-            create_file_if_not_exists(file_path)
-
-            with open(file_path, 'a') as new_file:
-                # output_string = "\t".join([query_name, partner_name + " " + "0\t" * 9 + "0", combined_score])
-                output_string = "\t".join([query_name, partner_name] + ["0"] * 10 + [combined_score])
-
-                # Write the result to the file
-                new_file.write(output_string + "\n")
-
-            print("\t".join([query_name, partner_name, combined_score]))
-        else:
-            print(l)
-
-    ## print
+    for _ in write_partner_files(iter_partner_records(my_genes), directory):
+        pass
 
 
 # delete_after_filename.delete_after_name(my_genes)
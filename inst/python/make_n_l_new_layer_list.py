@@ -1,16 +1,17 @@
 #import main
-from File_processor import InteractionProcessor
+from Network_cache import load_table
+from Layer_index import NESTED
 #from main import n_l
 
 
-def create_whole_list(new_layer_file, nested_lst):
-    interaction_processor = InteractionProcessor(new_layer_file)
-    interaction_processor.process_interactions()
-    new_list = [pr.name for pr in interaction_processor.total_proteins]
+def create_whole_list(new_layer_file, layer_index):
+    return create_whole_list_from_table(load_table(new_layer_file), layer_index)
 
-    for layer in nested_lst.nested_list:
-        for pr in layer:
-            new_list.append(pr)
+
+def create_whole_list_from_table(table, layer_index):
+    """create_whole_list for a layer held in memory as an InteractionTable."""
+    new_list = list(table.names)
+    new_list.extend(layer_index.names(NESTED))
 
     return new_list
 
@@ -0,0 +1,106 @@
+"""
+Shared fixtures of the Python engine tests: a small generated STRING dump
+(protein.links.detailed / protein.info pair and its offline index), so
+builds run without the web API, and a seed file of its strongest hubs.
+
+    cd inst/python && python -m pytest -q tests
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PYTHON_DIR))
+sys.path.insert(0, str(PYTHON_DIR / "benchmarks"))
+
+import String_offline  # noqa: E402
+from generate_network import scale_free_edges  # noqa: E402
+from get_files1 import HEADER  # noqa: E402
+
+TAXON = 9606
+DUMP_EDGES = 3000
+FIXTURES = [PYTHON_DIR / "scaffolds.tsv"] + [PYTHON_DIR.parent.parent / "tests" / "testthat" / f"up_to_layer{i}_cumulative.tsv"
+                                            for i in (2, 3, 4)]
+
+
+def string_id(i):
+    return f"{TAXON}.P{i:05d}"
+
+
+def protein_name(i):
+    return f"G{i:05d}"
+
+
+def write_dump(directory, n_edges, seed=0):
+    """
+    A STRING bulk download in miniature: protein.info.txt and
+    protein.links.detailed.txt (both directions of every link, seven
+    random channel scores and a combined score, 60% of them above the 0.95
+    cut) for a scale-free network. Returns (links, info, scores) where
+    scores maps (i, j) to the eight channel values.
+    """
+    rng = random.Random(seed + 1)
+    edges = scale_free_edges(n_edges, seed)
+    nodes = 1 + max(max(edge) for edge in edges)
+    directory = Path(directory)
+    info, links = directory / "protein.info.txt", directory / "protein.links.detailed.txt"
+    with open(info, "w", encoding="utf-8") as file:
+        file.write("#string_protein_id\tpreferred_name\tprotein_size\tannotation\n")
+        for i in range(nodes):
+            file.write(f"{string_id(i)}\t{protein_name(i)}\t100\tsynthetic protein\n")
+
+    scores = {}
+    with open(links, "w", encoding="utf-8") as file:
+        file.write("protein1 protein2 neighborhood fusion cooccurence coexpression "
+                   "experimental database textmining combined_score\n")
+        for i, j in edges:
+            combined = rng.randint(951, 999) if rng.random() < 0.6 else rng.randint(150, 950)
+            channels = [rng.randint(0, 999) for _ in range(7)] + [combined]
+            scores[(i, j)] = scores[(j, i)] = channels
+            for a, b in ((i, j), (j, i)):
+                file.write(" ".join([string_id(a), string_id(b)] + [str(c) for c in channels]) + "\n")
+    return links, info, scores
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch):
+    """No test reads or writes the user's response cache or reaches the web API."""
+    monkeypatch.setenv("PSD_CACHE", "off")
+    for name in ("PSD_STRING_DUMP", "PSD_STRING_API_URL", "PSD_CHECKPOINTS", "PSD_EXPORT", "PSD_REPORT"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture(scope="session")
+def string_dump(tmp_path_factory):
+    """(index_dir, scores) of the generated dump."""
+    directory = tmp_path_factory.mktemp("string_dump")
+    links, info, scores = write_dump(directory, DUMP_EDGES)
+    return String_offline.build_index(links, info, directory / "index"), scores
+
+
+@pytest.fixture
+def offline_string(string_dump, monkeypatch):
+    """Answer every STRING query from the generated dump."""
+    index_dir, _ = string_dump
+    monkeypatch.setenv("PSD_STRING_DUMP", str(index_dir))
+    return String_offline.offline_index()
+
+
+def write_seed(path, scores, members):
+    """A seed file of the links above 0.95 between the proteins members."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(HEADER)
+        for (i, j), channels in sorted(scores.items()):
+            if i < j and i in members and j in members and channels[-1] > 950:
+                file.write("\t".join([protein_name(i), protein_name(j), string_id(i), string_id(j)]
+                                     + ["0"] * 8 + [f"{channels[-1] / 1000:g}"]) + "\n")
+    return path
+
+
+@pytest.fixture
+def seed_file(string_dump, tmp_path):
+    """scaffolds.tsv of the dump's first 15 proteins (the hubs) and their links above 0.95."""
+    _, scores = string_dump
+    return write_seed(tmp_path / "scaffolds.tsv", scores, range(15))
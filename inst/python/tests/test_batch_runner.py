@@ -0,0 +1,52 @@
+import pytest
+
+from Batch_runner import run_batch, worker_rate_limit
+from String_offline import OfflineString
+from conftest import write_seed
+from string_server import StringStandIn
+
+
+class RecordingNetwork:
+    """The offline index, noting every protein whose partners are asked for."""
+
+    def __init__(self, index_dir):
+        self.network = OfflineString(index_dir)
+        self.partners_of = []
+
+    def query(self, method, identifiers, limit=None, required_score=400):
+        if method == "interaction_partners":
+            self.partners_of.extend(identifiers)
+        return self.network.query(method, identifiers, limit, required_score)
+
+
+def fetched_partners(index_dir, seeds, out_dir, monkeypatch):
+    """Proteins whose partners a batch of seeds fetched, with a fresh response cache."""
+    network = RecordingNetwork(index_dir)
+    with StringStandIn(network) as stand_in:
+        monkeypatch.setenv("PSD_STRING_API_URL", stand_in.url)
+        monkeypatch.setenv("PSD_CACHE", str(out_dir / "cache.sqlite"))
+        results = run_batch(seeds, 2, "2", out_dir, workers=2)
+    assert all(results.values())
+    return network.partners_of
+
+
+def test_seeds_share_fetched_partners(string_dump, tmp_path, monkeypatch):
+    index_dir, scores = string_dump
+    monkeypatch.setenv("PSD_RATE_LIMIT", "0")
+    seeds = [write_seed(tmp_path / "hubs.tsv", scores, range(15)),
+             write_seed(tmp_path / "next.tsv", scores, range(10, 30))]
+
+    alone = [set(fetched_partners(index_dir, [seed], tmp_path / seed.stem, monkeypatch)) for seed in seeds]
+    assert alone[0] & alone[1]
+
+    together = fetched_partners(index_dir, seeds, tmp_path / "batch", monkeypatch)
+    assert sorted(together) == sorted(alone[0] | alone[1])
+
+
+@pytest.mark.parametrize("limit, workers, expected", [(None, 4, 0.25), ("6", 3, 2.0), ("0", 5, 0.0)])
+def test_rate_limit_is_shared_by_the_workers(monkeypatch, limit, workers, expected):
+    if limit is None:
+        monkeypatch.delenv("PSD_RATE_LIMIT", raising=False)
+    else:
+        monkeypatch.setenv("PSD_RATE_LIMIT", limit)
+    assert worker_rate_limit(workers) == expected
@@ -0,0 +1,41 @@
+import pytest
+
+from Edge_builder import EdgeBuilder
+from Protein_attributes import Protein
+
+pyvis_network = pytest.importorskip("pyvis.network")
+
+
+def proteins(edges):
+    index = {}
+    for name0, name1, likelihood in edges:
+        protein0 = index.setdefault(name0, Protein(name0))
+        protein1 = index.setdefault(name1, Protein(name1))
+        protein0.add_interaction(protein1, likelihood)
+        protein1.add_interaction(protein0, likelihood)
+    return index
+
+
+def test_same_nodes_and_edges_as_pyvis():
+    layers = [[("DLG4", "SHANK3", 0.99), ("SHANK3", "HOMER1", 0.97)],
+              [("HOMER1", "DLG4", 0.96), ("GRIN1", "DLG4", 0.98), ("SHANK3", "DLG4", 0.99)]]
+    graph = pyvis_network.Network(font_color="black")
+    builder = EdgeBuilder(font_color="black")
+    for size, (color, edges) in zip((35, 20), zip(("#ff0000", "#00ff00"), layers)):
+        index = proteins(edges)
+
+        # what the pipeline did with pyvis before EdgeBuilder
+        for name in index:
+            graph.add_node(name, label=name, shape="dot", size=size, color=color)
+        for protein in index.values():
+            for partner, likelihood in protein.interactions.items():
+                graph.add_edge(protein.name, partner.name, label=likelihood, title=likelihood)
+
+        builder.add_nodes(index, shape="dot", size=size, color=color)
+        builder.add_edges(index.values())
+
+    built = builder.add_to(pyvis_network.Network(font_color="black"))
+    # compared as lists of item lists, so the key order counts
+    assert [list(node.items()) for node in built.nodes] == [list(node.items()) for node in graph.nodes]
+    assert [list(edge.items()) for edge in built.edges] == [list(edge.items()) for edge in graph.edges]
+    assert built.node_ids == graph.node_ids
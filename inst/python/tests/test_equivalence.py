@@ -0,0 +1,171 @@
+"""
+The layer pipeline against the baseline rules it replaced: main.py's
+create_nested_list_of_layers(_selective) and extend_graph_selective,
+NestedList.create_nested_list_of_layers_selective1 and the csv reading of
+InteractionProcessor, ported below as plain loops. Runs on the bundled
+fixtures and on generated scale-free networks, like benchmarks/bench_suite.py.
+"""
+import csv
+
+import pytest
+
+from Edge_builder import canonical_edge
+from File_processor import InteractionProcessor
+from Interaction_table import InteractionTable
+from Layer_index import ALL, NESTED, SELECTIVE
+from Nested_list_of_layers import NestedList
+from Network_builder import NetworkBuild
+from conftest import FIXTURES
+from generate_network import generate_network
+from get_files1 import HEADER
+
+# min_int of each file of a chain; the first file is the scaffold layer
+MIN_INTS = [[0, 2, 1, 1], [0, 1, 3, 2], [0, 0, 0, 0]]
+PREFIXES = (300, 1000, 2500, 5000)
+
+
+def baseline_proteins(file_path):
+    """
+    What the baseline InteractionProcessor.process_interactions built, as
+    name -> {partner name: score}: a repeated pair keeps its first position
+    and its last score, and proteins come in the order they first appear
+    in the pairs above 0.95.
+    """
+    interactions_data = {}
+    with open(file_path, "r") as file:
+        csv_reader = csv.reader(file, delimiter="\t")
+        next(csv_reader)
+        for line in csv_reader:
+            interactions_data[tuple(line[:2])] = [float(val) for val in line[4:]][8]
+
+    proteins = {}
+    for pair, score in interactions_data.items():
+        if score > 0.95:
+            for name in pair:
+                proteins.setdefault(name, {})
+    for (name0, name1), score in interactions_data.items():
+        if score > 0.95:
+            proteins[name0][name1] = score
+            proteins[name1][name0] = score
+    return proteins
+
+
+def baseline_select(proteins, previous, min_int, extra=()):
+    """
+    The threshold rule of create_nested_list_of_layers_selective (extra:
+    the last ALL layer) and of create_nested_list_of_layers_selective1 (no
+    extra): a protein not placed yet joins when every layer is still empty
+    or once its neighbours among the placed and extra proteins reach min_int.
+    """
+    placed = [name for layer in previous for name in layer]
+    layer = []
+    for name, interactions in proteins.items():
+        if name in placed:
+            continue
+        add = not any(previous)
+        count = 0
+        for reference in placed + list(extra):
+            if reference in interactions:
+                count += 1
+                if count >= min_int:
+                    add = True
+        if add:
+            layer.append(name)
+    return layer
+
+
+class BaselineBuild:
+    """main.py's layer lists and graph1, with pyvis' duplicate checks in add_node and add_edge."""
+
+    def __init__(self):
+        self.all_layers = []  # total_proteins_nested_list: one name -> interactions dict per file
+        self.selective = []   # total_proteins_nested_list_selective
+        self.nested = []      # n_l.nested_list
+        self.nodes = []       # (id, size, color) of every add_node that added a node
+        self.edges = []       # (from, to, label) of every add_edge that added an edge
+
+    def extend_graph_selective(self, file_path, s, min_int, color):
+        proteins = baseline_proteins(file_path)
+        placed = {name for layer in self.all_layers for name in layer}
+        self.all_layers.append({name: partners for name, partners in proteins.items() if name not in placed})
+        self.selective.append(baseline_select(proteins, self.selective, min_int, self.all_layers[-1]))
+        self.nested.append(baseline_select(proteins, self.nested, min_int))
+
+        node_ids = {node[0] for node in self.nodes}
+        self.nodes.extend((name, s, color) for name in proteins if name not in node_ids)
+        added = {canonical_edge(name0, name1) for name0, name1, _ in self.edges}
+        for layer in self.all_layers:
+            for name, partners in layer.items():
+                for partner, score in partners.items():
+                    if partner in proteins and canonical_edge(name, partner) not in added:
+                        added.add(canonical_edge(name, partner))
+                        self.edges.append((name, partner, score))
+
+
+@pytest.fixture(params=["fixtures", "generated"])
+def chain(request, tmp_path):
+    """Interaction files a build reads one after another, each holding the proteins of the one before."""
+    if request.param == "fixtures":
+        return FIXTURES
+    network = tmp_path / "network.tsv"
+    generate_network(network, PREFIXES[-1], seed=3)
+    rows = network.read_text(encoding="utf-8").splitlines(keepends=True)[1:]
+    files = []
+    for n in PREFIXES:
+        files.append(tmp_path / f"prefix_{n}.tsv")
+        files[-1].write_text(HEADER + "".join(rows[:n]), encoding="utf-8")
+    return files
+
+
+def processor_items(processor):
+    return [(protein.name, [(partner.name, score) for partner, score in protein.interactions.items()])
+            for protein in processor.total_proteins]
+
+
+def test_interaction_table_reads_like_the_baseline(chain, tmp_path):
+    # repeated, reversed and self pairs, a pair dropped by its later score, and a header-only file
+    edge_cases = tmp_path / "edge_cases.tsv"
+    zeros = "\t".join(["0"] * 10)
+    edge_cases.write_text(HEADER + "".join(
+        f"{a}\t{b}\t{zeros}\t{s}\n" for a, b, s in [("A", "B", "0.99"), ("B", "C", "0.96"), ("A", "B", "0.5"),
+                                                   ("C", "B", "0.97"), ("D", "E", "0.9"), ("E", "F", "0.99"),
+                                                   ("D", "E", "0.999"), ("C", "C", "0.99"), ("G", "H", "0.95")]),
+        encoding="utf-8")
+    header_only = tmp_path / "header_only.tsv"
+    header_only.write_text(HEADER, encoding="utf-8")
+
+    for path in list(chain) + [edge_cases, header_only]:
+        expected = [(name, list(partners.items())) for name, partners in baseline_proteins(path).items()]
+        table = InteractionTable.from_tsv(path)
+        assert processor_items(InteractionProcessor.from_table(table)) == expected, path
+
+        # the partners of every other protein, last one first, straight from the table
+        ids = list(range(len(table.names)))[::-2]
+        protein, partner, score = table.partners(ids)
+        assert list(zip([table.names[i] for i in protein], [table.names[j] for j in partner], score.tolist())) == [
+            (expected[i][0], name, likelihood) for i in ids for name, likelihood in expected[i][1]], path
+        processor = InteractionProcessor(path)
+        processor.process_interactions()
+        assert processor_items(processor) == expected, path
+
+
+@pytest.mark.parametrize("min_ints", MIN_INTS)
+def test_layers_and_graph_match_the_baseline(chain, min_ints, tmp_path):
+    baseline = BaselineBuild()
+    build = NetworkBuild(chain[0].name, "main.html", tmp_path, export="off", checkpoints=False, report=False)
+    nested_list = NestedList([])
+    for k, (path, min_int) in enumerate(zip(chain, min_ints)):
+        s, color = 35 - 5 * k, f"#00000{k}"
+        baseline.extend_graph_selective(path, s, min_int, color)
+        build.extend_graph_selective(str(path), s, min_int, color)
+        nested_list.create_nested_list_of_layers_selective1(str(path), min_int)
+
+    assert build.layer_index.layers(ALL) == [list(layer) for layer in baseline.all_layers]
+    assert build.layer_index.layers(SELECTIVE) == baseline.selective
+    assert build.layer_index.layers(NESTED) == baseline.nested
+    assert nested_list.nested_list == baseline.nested
+    assert any(len(layer) for layer in baseline.selective[1:])
+
+    builder = build.edge_builder
+    assert [(node["id"], node["size"], node["color"]) for node in builder.node_options] == baseline.nodes
+    assert [(edge["from"], edge["to"], edge["label"]) for edge in builder.edge_options] == baseline.edges
@@ -0,0 +1,58 @@
+import json
+
+from Layer_index import KINDS
+from Network_builder import build_network
+from String_cache import DEFAULT_TTL
+
+
+def build(seed_file):
+    return build_network(seed_file.name, 3, [2, 1], "main.html", seed_file.parent, renderer="stream",
+                         checkpoints=True, report=True)
+
+
+def layers_and_edges(network_build):
+    return {kind: network_build.layer_index.layers(kind) for kind in KINDS}, sorted(network_build.edge_builder.edges)
+
+
+def stages(seed_file):
+    with open(seed_file.parent / "main_report.json", encoding="utf-8") as file:
+        return [(stage["layer"], stage["stage"]) for stage in json.load(file)["stages"]]
+
+
+def test_resume_restores_the_same_layers(offline_string, seed_file):
+    fresh = layers_and_edges(build(seed_file))
+    resumed = layers_and_edges(build(seed_file))
+    assert resumed == fresh
+    assert [layer for layer, stage in stages(seed_file) if stage == "checkpoint_load"] == [1, 2, 3]
+
+
+def test_checkpoint_with_other_membership_is_recomputed(offline_string, seed_file):
+    fresh = layers_and_edges(build(seed_file))
+
+    checkpoint_path = seed_file.parent / "psd_checkpoints" / "layer_2" / "checkpoint.json"
+    with open(checkpoint_path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    checkpoint["membership"]["selective"].append("NOT_IN_THE_NETWORK")
+    with open(checkpoint_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+
+    assert layers_and_edges(build(seed_file)) == fresh
+    assert [layer for layer, stage in stages(seed_file) if stage == "checkpoint_load"] == [1, 2]
+    assert [layer for layer, stage in stages(seed_file) if stage == "fetch_network"] == [2, 3]
+    with open(checkpoint_path, encoding="utf-8") as file:
+        assert "NOT_IN_THE_NETWORK" not in json.load(file)["membership"]["selective"]
+
+
+def test_expired_checkpoint_is_recomputed(offline_string, seed_file):
+    fresh = layers_and_edges(build(seed_file))
+
+    checkpoint_path = seed_file.parent / "psd_checkpoints" / "layer_1" / "checkpoint.json"
+    with open(checkpoint_path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    checkpoint["saved_at"] -= DEFAULT_TTL + 1
+    with open(checkpoint_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+
+    assert layers_and_edges(build(seed_file)) == fresh
+    assert [layer for layer, stage in stages(seed_file) if stage == "checkpoint_load"] == []
+    assert [layer for layer, stage in stages(seed_file) if stage == "fetch_network"] == [1, 2, 3]
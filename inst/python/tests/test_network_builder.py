@@ -0,0 +1,62 @@
+import json
+import sys
+
+import pytest
+
+from Network_builder import build_network, options_from_env
+
+EXTRA_OUTPUTS = ("main.npz", "main_report.json", "psd_checkpoints")
+
+
+def test_default_build_writes_only_the_page(offline_string, seed_file):
+    build = build_network(seed_file.name, 2, [2], "main.html", seed_file.parent, renderer="stream")
+    assert build.out.exists()
+    assert not any((seed_file.parent / name).exists() for name in EXTRA_OUTPUTS)
+    assert len(build.layer_index.layers()) == 3
+
+
+@pytest.mark.parametrize("layout", ["physics", "radial"])
+def test_stream_renderer_does_not_need_pyvis(offline_string, seed_file, monkeypatch, layout):
+    monkeypatch.setitem(sys.modules, "pyvis", None)
+    monkeypatch.setitem(sys.modules, "pyvis.network", None)
+    build = build_network(seed_file.name, 2, [2], "main.html", seed_file.parent, renderer="stream", layout=layout)
+    physics = '"enabled": false' if layout == "radial" else '"enabled": true'
+    assert f'"physics": {{\n        {physics}' in build.out.read_text(encoding="utf-8")
+
+
+def test_env_turns_on_export_report_and_checkpoints(offline_string, seed_file, monkeypatch):
+    monkeypatch.setenv("PSD_EXPORT", "npz")
+    monkeypatch.setenv("PSD_REPORT", "1")
+    monkeypatch.setenv("PSD_CHECKPOINTS", "1")
+    options = options_from_env()
+    options["renderer"] = "stream"
+    build_network(seed_file.name, 2, [2], "main.html", seed_file.parent, **options)
+    assert all((seed_file.parent / name).exists() for name in EXTRA_OUTPUTS)
+
+
+def test_build_writes_report(offline_string, seed_file):
+    build = build_network(seed_file.name, 2, [2], "main.html", seed_file.parent, renderer="stream", report=True)
+    with open(seed_file.parent / "main_report.json", encoding="utf-8") as file:
+        report = json.load(file)
+    assert not report["failed"]
+    assert report["settings"]["thresholds"] == [2, 2]
+    assert [layer["layer"] for layer in report["layers"]] == [0, 1, 2, None]
+    assert report["total"]["nodes"] == len(build.edge_builder.nodes)
+    assert report["total"]["edges"] == len(build.edge_builder.edges)
+    assert report["total"]["process_rss_peak_mb"] == max(stage["process_rss_peak_mb"] for stage in report["stages"])
+
+
+@pytest.mark.parametrize("stream_layers", [True, False])
+def test_build_twice_writes_the_same_files(offline_string, seed_file, stream_layers):
+    # the layer files go next to out (sub/), not into the work directory
+    sub = seed_file.parent / "sub"
+    sub.mkdir()
+    seed_file.rename(sub / seed_file.name)
+    written = []
+    for _ in range(2):
+        build = build_network(seed_file.name, 3, [2], "sub/x.html", seed_file.parent, stream_layers=stream_layers,
+                              write_layer_files=True, renderer="stream", checkpoints=False)
+        written.append({path.name: path.read_text(encoding="utf-8") for path in sorted(sub.glob("up_to_layer*.tsv"))})
+        written[-1]["edges"] = sorted(build.edge_builder.edges)
+    assert "up_to_layer4_cumulative.tsv" in written[0]
+    assert written[0] == written[1]
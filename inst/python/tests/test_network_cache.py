@@ -0,0 +1,18 @@
+import Network_cache
+from Network_cache import load_selector, load_table
+from get_files1 import interaction_row, write_rows
+
+
+def test_rewritten_file_is_parsed_again(tmp_path, monkeypatch):
+    path = tmp_path / "up_to_layer2_cumulative.tsv"
+    write_rows(path, [interaction_row("A", "B", "0.99")], append=False)
+
+    # a filesystem whose size and timestamps cannot tell the two versions apart
+    monkeypatch.setattr(Network_cache, "file_signature", lambda path: (1, 1, 1, 1))
+    assert load_table(path).names == ["A", "B"]
+    assert load_selector(path).select([["A"]], 1) == ["B"]
+
+    write_rows(path, [interaction_row("C", "D", "0.99")], append=False)
+    assert load_table(path).names == ["C", "D"]
+    assert load_selector(path).select([["C"]], 1) == ["D"]
+
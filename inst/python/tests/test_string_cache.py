@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+import String_cache
+from String_cache import StringResponseCache
+
+
+def test_every_call_closes_its_connection(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def recording_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(String_cache.sqlite3, "connect", recording_connect)
+    cache = StringResponseCache(tmp_path / "cache.sqlite")
+    key = cache.make_key("network", 9606, "12.0", None, ["B", "A"])
+    assert cache.claim([key]) == [key]
+    cache.put(key, "A\tB\n", "network")
+    cache.release([key])
+    assert cache.get(key) == "A\tB\n"
+    assert cache.get(cache.make_key("network", 9606, "12.0", None, ["C"])) is None
+    with pytest.raises(sqlite3.IntegrityError):
+        with cache._connect() as conn:
+            conn.execute("INSERT INTO claims VALUES (?, ?)", (key, 0))
+            conn.execute("INSERT INTO claims VALUES (?, ?)", (key, 0))
+    cache.clear()
+
+    assert len(opened) == 8
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
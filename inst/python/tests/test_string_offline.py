@@ -0,0 +1,50 @@
+import pytest
+
+import String_api
+from conftest import TAXON, protein_name, string_id
+
+
+def api_row(i, j, channels):
+    """The tsv-no-header row STRING sends for the link i-j: combined score first, then the seven channels."""
+    return "\t".join([string_id(i), string_id(j), protein_name(i), protein_name(j), str(TAXON)]
+                     + [format(v / 1000, "g") for v in [channels[-1]] + channels[:-1]])
+
+
+def expected_partners(scores, i, limit=None, required_score=400):
+    partners = sorted(((j, channels) for (a, j), channels in scores.items() if a == i and channels[-1] >= required_score),
+                      key=lambda item: (-item[1][-1], item[0]))
+    return [api_row(i, j, channels) for j, channels in partners[:limit]]
+
+
+def rows(text):
+    return text.splitlines()
+
+
+@pytest.mark.parametrize("limit, required_score", [(None, 400), (10, 400), (5, 900), (None, 0)])
+def test_interaction_partners(offline_string, string_dump, limit, required_score):
+    _, scores = string_dump
+    for i in (0, 7, 150):
+        text = offline_string.interaction_partners([protein_name(i)], limit, required_score)
+        assert rows(text) == expected_partners(scores, i, limit, required_score)
+
+
+def test_network(offline_string, string_dump):
+    _, scores = string_dump
+    members = [3, 0, 42, 17, 9, 1, 250, 5]
+    expected = {api_row(i, j, channels) for (i, j), channels in scores.items()
+                if i < j and i in members and j in members and channels[-1] >= 400}
+    answer = rows(offline_string.network([protein_name(i) for i in members]))
+    assert len(answer) == len(expected)
+    assert set(answer) == expected
+
+
+def test_identifiers_and_species(offline_string, string_dump):
+    # STRING ids and preferred names name the same protein; unknown ones are skipped
+    by_name = offline_string.query("interaction_partners", [protein_name(4), "NOT_A_PROTEIN"], limit=10)
+    assert offline_string.query("interaction_partners", [string_id(4)], limit=10) == by_name
+    assert offline_string.query("network", []) == ""
+
+    # String_api answers from the dump for its species and rejects any other
+    assert String_api.query("interaction_partners", [protein_name(4)], limit=10, required_score=400) == by_name
+    with pytest.raises(ValueError):
+        String_api.query("interaction_partners", [protein_name(4)], species=10090, limit=10)